@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from app.core.streaming import SSE_HEADERS, sse_event
 from app.schemas.query import QueryRequest, QueryResponse
 from app.schemas.user import User
 from app.services import chatbot_service
@@ -12,6 +15,8 @@ service = chatbot_service.ChatBotService()
 class ChatRequest(BaseModel):
     thread_id: str
     message: str
+    # Ground the reply in this resume's chunks (when RESUME_RAG_ENABLED)
+    resume_id: Optional[int] = None
 
 
 class ChatResponse(BaseModel):
@@ -19,6 +24,19 @@ class ChatResponse(BaseModel):
     response: str
 
 
+class ChatHistoryMessage(BaseModel):
+    role: str
+    content: str
+    seq: int
+
+
+class ChatHistoryPage(BaseModel):
+    messages: List[ChatHistoryMessage]
+    # Pass as ``before`` to fetch the previous (older) page
+    next_cursor: Optional[int] = None
+    has_more: bool = False
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def query(
     request: ChatRequest,
@@ -29,7 +47,7 @@ async def query(
     try:
         user_id = current_user.id
         # Use the service to process the query
-        result = await service.generate_response(user_id, request.thread_id, request.message)
+        result = await service.generate_response(user_id, request.thread_id, request.message, request.resume_id)
 
         # Return the processed result
         return ChatResponse(thread_id=str(request.thread_id), response=result)
@@ -40,19 +58,39 @@ async def query(
         # Handle any other errors that might occur during processing
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
     
-@router.get("/chat/history/{thread_id}", response_model=list[dict])
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the chatbot reply token-by-token as Server-Sent Events"""
+    user_id = current_user.id
+
+    async def event_stream():
+        tokens = []
+        try:
+            async for token in service.stream_response(user_id, request.thread_id, request.message, request.resume_id):
+                tokens.append(token)
+                yield sse_event({"token": token}, event="token")
+            yield sse_event({"thread_id": str(request.thread_id), "response": "".join(tokens)}, event="done")
+        except Exception as e:
+            yield sse_event({"detail": f"Error processing query: {str(e)}"}, event="error")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.get("/chat/history/{thread_id}", response_model=ChatHistoryPage)
 async def get_chat_history(
     thread_id: int,
+    before: Optional[int] = Query(default=None, description="Return messages older than this cursor"),
+    limit: int = Query(default=50, ge=1, le=200),
     current_user: User = Depends(get_current_user)
-) -> list[dict]:
-    """Retrieve chat history for a given thread."""
+) -> ChatHistoryPage:
+    """Retrieve one page of chat history for a given thread, newest page first."""
     try:
         user_id = current_user.id
-        # The service now returns a list of dicts: [{'role': 'human', ...}, ...]
-        messages = await service.get_chat_history(user_id, str(thread_id))
+        page = await service.get_chat_history(user_id, str(thread_id), before=before, limit=limit)
         
-        # FIX 2: Return messages directly. Do NOT call .dict()
-        return messages 
+        return ChatHistoryPage(**page)
 
     except HTTPException:
         raise
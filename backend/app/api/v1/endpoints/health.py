@@ -1,9 +1,21 @@
 from fastapi import APIRouter
 from app.schemas.common import HealthResponse
+from app.external import llm_gateway
+from app.services.llm_service import query_conversation_store
+from app.services.pdf_extraction_pool import pdf_extraction_pool
 
 router = APIRouter()
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return HealthResponse(status="healthy", service="JobFit-AI") 
\ No newline at end of file
+    return HealthResponse(status="healthy", service="JobFit-AI")
+
+@router.get("/metrics")
+async def metrics():
+    """Runtime metrics for the LLM gateway, the /query conversation store and PDF extraction"""
+    return {
+        "llm": llm_gateway.snapshot(),
+        "query_conversations": query_conversation_store.snapshot(),
+        "pdf_extraction": pdf_extraction_pool.snapshot(),
+    }
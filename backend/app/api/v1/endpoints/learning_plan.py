@@ -4,7 +4,8 @@ from app.core.database import get_db
 from app.schemas.user import User as UserSchema
 from app.services.auth_service import get_current_user
 from app.services.learning_plan_service import LearningPlanService
-from app.schemas.learning_plan import LearningPlanRequest, LearningPlanResponse
+from app.services.learning_plan_queue import learning_plan_queue, QueueFullError
+from app.schemas.learning_plan import LearningPlanRequest, LearningPlanResponse, LearningPlanGenerateResponse, LearningPlanJobStatus
 from app.db.models import ResumeDetails
 
 router = APIRouter()
@@ -36,7 +37,8 @@ async def generate_learning_plan(
             timeline_months=request.timeline_months,
             experience_level=request.experience_level,
             job_analysis_id=request.job_analysis_id,
-            rag_enabled=request.rag_enabled
+            rag_enabled=request.rag_enabled,
+            regenerate=request.regenerate
         )
 
         if not result.get("success"):
@@ -49,3 +51,54 @@ async def generate_learning_plan(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.post("/learning-plan/generate/async", response_model=LearningPlanGenerateResponse, status_code=202)
+async def generate_learning_plan_async(
+    request: LearningPlanRequest,
+    current_user: UserSchema = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Queue learning plan generation and return immediately; poll /learning-plan/jobs/{plan_id} for the result"""
+
+    resume = db.query(ResumeDetails).filter(
+        ResumeDetails.resume_id == request.resume_id,
+        ResumeDetails.user_id == current_user.id
+    ).first()
+
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    try:
+        job = learning_plan_queue.submit(db, current_user.id, request)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return LearningPlanGenerateResponse(
+        plan_id=job.plan_id,
+        status=job.status,
+        estimated_completion=learning_plan_queue.estimate_completion()
+    )
+
+
+@router.get("/learning-plan/jobs/{plan_id}", response_model=LearningPlanJobStatus)
+async def get_learning_plan_job(
+    plan_id: str,
+    current_user: UserSchema = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the status of a queued learning plan, including the plan once it is completed"""
+
+    job = learning_plan_queue.get_job(db, plan_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Learning plan job not found")
+
+    return LearningPlanJobStatus(
+        plan_id=job.plan_id,
+        status=job.status,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at,
+        error=job.error,
+        result=job.result
+    )
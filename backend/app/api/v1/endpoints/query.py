@@ -1,16 +1,17 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from app.core.streaming import SSE_HEADERS, sse_event
 from app.schemas.query import QueryRequest, QueryResponse
 from app.services.llm_service import OPENAIService
 
 router = APIRouter()
+# Long-lived: the graph is compiled once and conversation history survives between requests
+llm_service = OPENAIService()
 
 @router.post("/query", response_model=QueryResponse)
 async def query(request: QueryRequest):
     """Handle query requests"""
     try:
-        # Instantiate the LLM service directly (no factory)
-        llm_service = OPENAIService()
-        
         # Use the service to process the query
         result = await llm_service.generate_response(request.query, request.id)
         
@@ -26,4 +27,21 @@ async def query(request: QueryRequest):
         raise
     except Exception as e:
         # Handle any other errors that might occur during processing
-        raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
+
+
+@router.post("/query/stream")
+async def query_stream(request: QueryRequest):
+    """Stream the answer to a query as Server-Sent Events"""
+
+    async def event_stream():
+        tokens = []
+        try:
+            async for token in llm_service.stream_response(request.query, request.id):
+                tokens.append(token)
+                yield sse_event({"token": token}, event="token")
+            yield sse_event({"id": request.id, "query": request.query, "response": "".join(tokens)}, event="done")
+        except Exception as e:
+            yield sse_event({"detail": f"Error processing query: {str(e)}"}, event="error")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
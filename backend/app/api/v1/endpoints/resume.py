@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.config import settings
 from app.core.database import get_db
+from app.db.vector_store import index_resume, unindex_resume
 from app.db.models import ResumeDetails, User as UserModel
-from app.schemas.resume import ResumeDetails as ResumeSchema, ResumeDetailsCreate, ResumeDetailsUpdate
+from app.schemas.resume import ResumeDetails as ResumeSchema, ResumeDetailsCreate, ResumeDetailsUpdate, ResumeDetailsSummary
 from app.schemas.user import User as UserSchema
 from app.services.auth_service import get_current_user
 
@@ -11,6 +13,7 @@ router = APIRouter()
 
 @router.post("/resumes", response_model=ResumeSchema)
 async def create_resume(
+    background_tasks: BackgroundTasks,
     file_name: str = Form(...),
     resume_text: str = Form(...),
     current_user: UserSchema = Depends(get_current_user),
@@ -25,6 +28,8 @@ async def create_resume(
     db.add(db_resume)
     db.commit()
     db.refresh(db_resume)
+    if settings.RESUME_RAG_ENABLED:
+        background_tasks.add_task(index_resume, current_user.id, db_resume.resume_id, resume_text)
     return ResumeSchema.from_orm(db_resume)
 
 @router.get("/resumes/{resume_id}", response_model=ResumeSchema)
@@ -43,20 +48,21 @@ async def get_resume(
         raise HTTPException(status_code=404, detail="Resume not found")
     return ResumeSchema.from_orm(db_resume)
 
-@router.get("/resumes", response_model=List[ResumeSchema])
+@router.get("/resumes", response_model=List[ResumeDetailsSummary])
 async def get_user_resumes(
     current_user: UserSchema = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all resumes for the current user"""
+    """Get all resumes for the current user (preview only; full text via /resumes/{resume_id})"""
     resumes = db.query(ResumeDetails).filter(
         ResumeDetails.user_id == current_user.id
     ).all()
-    return [ResumeSchema.from_orm(resume) for resume in resumes]
+    return [ResumeDetailsSummary.from_orm(resume) for resume in resumes]
 
 @router.put("/resumes/{resume_id}", response_model=ResumeSchema)
 async def update_resume(
     resume_id: int,
+    background_tasks: BackgroundTasks,
     file_name: str = Form(...),
     resume_text: str = Form(...),
     current_user: UserSchema = Depends(get_current_user),
@@ -72,6 +78,11 @@ async def update_resume(
         raise HTTPException(status_code=404, detail="Resume not found")
 
     db_resume.file_name = file_name
+    if resume_text != db_resume.resume_text:
+        # Edited text no longer matches the uploaded file, so it must not be reused for it
+        db_resume.content_hash = None
+        if settings.RESUME_RAG_ENABLED:
+            background_tasks.add_task(index_resume, current_user.id, resume_id, resume_text)
     db_resume.resume_text = resume_text
 
     db.commit()
@@ -81,6 +92,7 @@ async def update_resume(
 @router.delete("/resumes/{resume_id}")
 async def delete_resume(
     resume_id: int,
+    background_tasks: BackgroundTasks,
     current_user: UserSchema = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -95,4 +107,6 @@ async def delete_resume(
 
     db.delete(db_resume)
     db.commit()
+    if settings.RESUME_RAG_ENABLED:
+        background_tasks.add_task(unindex_resume, resume_id)
     return {"message": "Resume deleted successfully"}
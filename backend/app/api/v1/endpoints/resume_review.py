@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException, Form, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.streaming import SSE_HEADERS, sse_event
 from app.schemas.resume_review import ResumeReviewRequest, ResumeReviewResponse, ResumeReview
 from app.services.resume_review_service import ResumeReviewService
 from app.core.database import get_db
@@ -32,20 +34,20 @@ async def review_resume(
         # Process supplied text (frontend must send same text tied to resume_id)
         request = ResumeReviewRequest(resume_text=resume_text, k=k, lambda_mult=lambda_mult)
         service = ResumeReviewService()
-        result = await service.process(request)
+        result = await service.process(request, db=db)
         if not result.get("success"):
             raise HTTPException(status_code=400, detail=result.get("message", "Resume review failed"))
 
         review_data = result["data"]["review"]
 
-        # Persist result
-        critique = ResumeCritique(
+        # Persist result (cache hits only add a row if this resume's latest critique differs)
+        service.save_review(
+            db,
             user_id=current_user.id,
             resume_id=resume_id,
-            review=review_data
+            review=review_data,
+            content_hash=result["data"]["content_hash"],
         )
-        db.add(critique)
-        db.commit()
 
         return ResumeReviewResponse(review=ResumeReview(**review_data))
     except HTTPException:
@@ -53,6 +55,38 @@ async def review_resume(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reviewing resume: {str(e)}")
 
+@router.post("/resume/review/stream")
+async def review_resume_stream(
+    resume_id: int = Form(...),
+    resume_text: str = Form(...),
+    k: int = Form(2),
+    lambda_mult: float = Form(0.5),
+    db: Session = Depends(get_db),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """Stream review fields as Server-Sent Events as soon as each one is complete"""
+    db_resume = db.query(ResumeDetails).filter(
+        ResumeDetails.resume_id == resume_id,
+        ResumeDetails.user_id == current_user.id
+    ).first()
+    if not db_resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    request = ResumeReviewRequest(resume_text=resume_text, k=k, lambda_mult=lambda_mult)
+    service = ResumeReviewService()
+    if not await service.validate(request):
+        raise HTTPException(status_code=400, detail="Resume text is required")
+
+    async def event_stream():
+        try:
+            async for event, data in service.stream_review(request, current_user.id, resume_id):
+                yield sse_event(data, event=event)
+        except Exception as e:
+            yield sse_event({"detail": f"Error reviewing resume: {str(e)}"}, event="error")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.get("/resume/{resume_id}/review", response_model=ResumeReviewResponse)
 async def get_latest_resume_review(
     resume_id: int,
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from app.schemas.api import PDFExtractionAPIResponse, PDFExtractionAPIRequest
 from app.services.pdf_extraction_service import PDFExtractionService
+from app.services.pdf_extraction_pool import ExtractionQueueFullError
 
 router = APIRouter()
 
@@ -9,12 +10,14 @@ service = PDFExtractionService()
 @router.post("/extract/pdf", response_model=PDFExtractionAPIResponse)
 async def extract_pdf(file_path: PDFExtractionAPIRequest):
     try:
-        result = await service.process(file_path.file_path)
+        result = await service.process(file_path.file_path, extraction_mode=file_path.extraction_mode)
         
         if not result.get("success"):
             raise HTTPException(status_code=400, detail=result.get("message", "Invalid file"))
         
         return result
+    except ExtractionQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
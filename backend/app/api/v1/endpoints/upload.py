@@ -1,9 +1,17 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+import json
+from typing import List
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, HTTPException, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.schemas.api import FileUplaodAPIResponse
-from app.services.file_upload_service import FileUploadService
+from app.schemas.api import ResumeUploadAPIResponse
+from app.services.file_upload_service import FileUploadService, FileTooLargeError
 from app.services.pdf_extraction_service import PDFExtractionService
+from app.services.pdf_extraction_pool import ExtractionQueueFullError
+from app.services.resume_ingest_service import ResumeIngestService, find_extracted_text, find_user_resume
+from app.core.config import settings
 from app.core.database import get_db
+from app.db.vector_store import index_resume
 from app.db.models import ResumeDetails, User as UserModel
 from app.services.auth_service import get_current_user
 from app.schemas.user import User as UserSchema
@@ -12,54 +20,86 @@ router = APIRouter()
 
 file_service = FileUploadService()
 pdf_service = PDFExtractionService()
+ingest_service = ResumeIngestService(file_service, pdf_service)
 
-@router.post("/upload/pdf", response_model=FileUplaodAPIResponse)
+@router.post("/upload/pdf", response_model=ResumeUploadAPIResponse)
 async def upload_pdf(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: UserSchema = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     try:
         # Step 1: Upload and save file
-        upload_result = await file_service.process(file)
+        try:
+            upload_result = await file_service.process(file)
+        except FileTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
 
         if not upload_result.get("success"):
             raise HTTPException(status_code=400, detail=upload_result.get("message", "Invalid file"))
 
         file_path = upload_result["data"].path
+        content_hash = upload_result["data"].sha256
+        message = "PDF uploaded, processed, and resume created successfully"
+        pages_processed = None
+        reused_text = False
 
-        # Step 2: Extract text from PDF
-        pdf_result = await pdf_service.process(file_path)
+        # Step 2: Same file uploaded again by this user -> reuse the existing resume as is
+        db_resume = find_user_resume(db, current_user.id, content_hash)
 
-        if not pdf_result.get("success"):
-            raise HTTPException(status_code=400, detail=pdf_result.get("message", "Error extracting PDF text"))
+        if db_resume:
+            message = "PDF already uploaded, existing resume reused"
+            reused_text = True
+        else:
+            # Step 3: Reuse text extracted from an earlier upload of the same file, else extract it
+            extracted_text = find_extracted_text(db, content_hash)
 
-        extracted_text = pdf_result["data"].full_text
+            if extracted_text is not None:
+                reused_text = True
+            else:
+                try:
+                    pdf_result = await pdf_service.process(file_path, content_hash=content_hash)
+                except ExtractionQueueFullError as e:
+                    raise HTTPException(status_code=503, detail=str(e))
 
-        # Step 3: Create resume record in database
-        db_resume = ResumeDetails(
-            user_id=current_user.id,
-            file_name=file.filename,
-            file_path=file_path,
-            resume_text=extracted_text
-        )
-        db.add(db_resume)
-        db.commit()
-        db.refresh(db_resume)
+                if not pdf_result.get("success"):
+                    raise HTTPException(status_code=400, detail=pdf_result.get("message", "Error extracting PDF text"))
 
-        # Step 4: Return combined result
+                extracted_text = pdf_result["data"].full_text
+                pages_processed = pdf_result["data"].pages
+
+            # Step 4: Create resume record in database
+            db_resume = ResumeDetails(
+                user_id=current_user.id,
+                file_name=file.filename,
+                file_path=file_path,
+                resume_text=extracted_text,
+                content_hash=content_hash,
+            )
+            db.add(db_resume)
+            db.commit()
+            db.refresh(db_resume)
+
+            if settings.RESUME_RAG_ENABLED:
+                background_tasks.add_task(index_resume, current_user.id, db_resume.resume_id, extracted_text)
+
+        # Step 5: Return combined result (reviews are cached by text hash, so they carry over too)
         return {
-            "message": "PDF uploaded, processed, and resume created successfully",
+            "message": message,
             "success": True,
             "data": {
                 "name": file.filename,
                 "path": file_path,
-                "size": file.size,
+                "size": upload_result["data"].size,
                 "created_at": upload_result["data"].created_at,
+                "sha256": content_hash,
+                "duplicate": upload_result["data"].duplicate,
                 "resume_id": db_resume.resume_id,
-                "pages_processed": pdf_result["data"].pages,
-                "text_length": len(extracted_text),
-                "resume_text": extracted_text  # Add full text to response
+                "pages_processed": pages_processed,
+                "text_length": len(db_resume.resume_text or ""),
+                "resume_preview": db_resume.resume_preview,
+                "reused_text": reused_text,
             }
         }
 
@@ -70,3 +110,24 @@ async def upload_pdf(
         raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
 
 
+@router.post("/upload/bulk")
+async def upload_bulk(
+    files: List[UploadFile] = File(...),
+    current_user: UserSchema = Depends(get_current_user),
+):
+    """
+    Upload many resumes at once: any mix of PDFs and zip archives of PDFs.
+
+    Responds with newline-delimited JSON, one status object per file as soon as
+    it is known ("created", "duplicate", "skipped" or "error"), then a final
+    {"status": "done", "summary": {...}} line. Past BULK_UPLOAD_MAX_FILES files a
+    single "truncated" line names the first file left out and the rest are ignored.
+    """
+    if not files:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+
+    async def status_stream():
+        async for status in ingest_service.process(current_user.id, files):
+            yield json.dumps(jsonable_encoder(status)) + "\n"
+
+    return StreamingResponse(status_stream(), media_type="application/x-ndjson")
@@ -14,6 +14,84 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Resume review cache (in-memory LRU in front of resume_critiques)
+    REVIEW_CACHE_SIZE: int = 512
+
+    # LLM gateway (per-provider limits, retries and circuit breaker)
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_RATE_PER_SECOND: float = 5.0
+    LLM_BURST: int = 10
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_DELAY: float = 0.5
+    LLM_RETRY_MAX_DELAY: float = 8.0
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # Request hedging: duplicate calls slower than the recent LLM_HEDGE_PERCENTILE latency
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = 0.5
+    # Hedges earned per primary call (0.05 = at most ~5% extra requests), and the most that can be banked
+    LLM_HEDGE_BUDGET_RATIO: float = 0.05
+    LLM_HEDGE_BUDGET_BURST: float = 5.0
+    # Point the chat and embedding clients at a local OpenAI-compatible stand-in
+    # (see llm_standin.py), e.g. http://localhost:8100/v1. Empty uses A4F.
+    LLM_STANDIN_URL: str = ""
+
+    # Job skill extraction: lexicon first, LLM only as an optional enrichment step
+    SKILL_LLM_ENRICHMENT: bool = False
+
+    # Prompt compaction budgets in tokens (0 disables compaction)
+    JOB_DESCRIPTION_TOKEN_BUDGET: int = 1200
+    RESUME_TOKEN_BUDGET: int = 3000
+
+    # /query conversation store (in-memory, bounded)
+    QUERY_MAX_THREADS: int = 1000
+    QUERY_THREAD_TTL_SECONDS: float = 3600.0
+    QUERY_STORE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    # Chat memory: recent turns verbatim, older turns folded into a rolling summary
+    CHAT_MEMORY_KEEP_TURNS: int = 6
+    CHAT_MEMORY_SUMMARIZE_EVERY: int = 4
+
+    # Uploads are streamed to disk in UPLOAD_CHUNK_BYTES chunks and rejected above MAX_UPLOAD_BYTES
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+
+    # PDF text extraction process pool
+    PDF_EXTRACTION_WORKERS: int = 2
+    PDF_EXTRACTION_MAX_PENDING: int = 32
+    PDF_EXTRACTION_TIMEOUT_SECONDS: float = 30.0
+    # Pages per parallel extraction job; smaller PDFs are parsed in one job
+    PDF_PAGES_PER_JOB: int = 8
+    # Extracted page text cache: files unused for longer than the max age are dropped,
+    # then the least recently used ones until the cache fits in the size limit
+    PDF_PAGE_CACHE_MAX_MB: int = 512
+    PDF_PAGE_CACHE_MAX_AGE_HOURS: float = 7 * 24
+
+    # Bulk resume upload (/upload/bulk)
+    BULK_UPLOAD_MAX_FILES: int = 500
+    # Whole bulk request (all files and archives together), checked before the form is parsed
+    BULK_UPLOAD_MAX_BYTES: int = 500 * 1024 * 1024
+    BULK_UPLOAD_CONCURRENCY: int = 4
+    BULK_INSERT_BATCH_SIZE: int = 50
+    BULK_INSERT_FLUSH_SECONDS: float = 1.0
+
+    # Resume RAG: chunks of every resume in one shared Chroma collection, filtered per user
+    RESUME_RAG_ENABLED: bool = False
+    RESUME_RAG_K: int = 3
+    RESUME_RAG_LAMBDA_MULT: float = 0.5
+
+    # Background learning-plan generation
+    LEARNING_PLAN_WORKERS: int = 4
+    LEARNING_PLAN_MAX_PENDING: int = 200
+    # A generation running longer than the lease is cancelled and failed; "running" jobs whose
+    # lease has expired (their process died) are requeued by a sweep every LEASE_SWEEP_SECONDS
+    LEARNING_PLAN_JOB_LEASE_SECONDS: float = 900.0
+    LEARNING_PLAN_LEASE_SWEEP_SECONDS: float = 60.0
+
     # Get upload path relative to current working directory (backend/)
     @property
     def UPLOAD_BASE_DIR(self) -> str:
@@ -59,19 +59,21 @@ class AsyncDatabase:
     async def disconnect(self):
         if self.pool:
             await self.pool.close()
+            self.pool = None
             print("🛑 Async Chat DB Pool Closed")
 
-    # Helper to get a checkpointer quickly
-    async def get_checkpointer(self):
-        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
-        
+    # Helper to get a pool-backed checkpointer; create one per graph run.
+    # Given the pool (not a connection), it borrows a connection only for each
+    # checkpoint read/write, never across an LLM call. AsyncPostgresSaver also
+    # holds an asyncio.Lock around every query, so a single saver shared by all
+    # requests would run their checkpoint I/O one at a time.
+    def get_checkpointer(self):
         if not self.pool:
              raise RuntimeError("Database pool is not initialized")
 
+        from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
         # We assume the pool is already connected via lifespan
-        async with self.pool.connection() as conn:
-            checkpointer = AsyncPostgresSaver(conn)
-            yield checkpointer
+        return AsyncPostgresSaver(self.pool)
 
 # Global instance
 async_db = AsyncDatabase()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import json
+from typing import Dict
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Room for multipart boundaries and part headers on top of the file size itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class RequestSizeLimitMiddleware:
+    """Rejects oversized request bodies on the given paths before they are parsed.
+
+    FastAPI reads (and Starlette spools to disk) the whole multipart form before
+    an endpoint or its dependencies run, so size checks there come too late. A
+    declared Content-Length above the limit gets a 413 straight away; bodies sent
+    without one (chunked) are counted as they arrive and cut off at the limit,
+    with an HTTPException that FastAPI turns into the same 413.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                await self._reject(send, limit)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=self._message(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    @staticmethod
+    def _message(limit: int) -> str:
+        return f"Request too large. Maximum size is {limit / (1024 * 1024):.3g} MB."
+
+    @classmethod
+    async def _reject(cls, send: Send, limit: int) -> None:
+        body = json.dumps({"detail": cls._message(limit)}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,48 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable, Optional, Set
+
+# Headers that stop proxies (nginx) from buffering the event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_END = object()
+
+# Strong references so detached producer tasks are not garbage collected mid-run
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+    """Format a single Server-Sent Event frame with a JSON payload."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data, default=str)}\n\n"
+
+
+async def relay_in_background(producer: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+    """Run an async producer in a detached task and relay its items.
+
+    The producer keeps running to completion even if the consumer goes away
+    (e.g. the client closes the SSE connection), so side effects at the end of
+    a run, such as the final checkpoint write, still happen.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run() -> None:
+        try:
+            async for item in producer():
+                queue.put_nowait(item)
+        except Exception as e:
+            queue.put_nowait(e)
+        finally:
+            queue.put_nowait(_END)
+
+    task = asyncio.create_task(run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    while True:
+        item = await queue.get()
+        if item is _END:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred, validates
 from app.core.database import Base
+from app.db.types import CompressedText
+
+# Characters of resume text kept uncompressed for list views
+RESUME_PREVIEW_LENGTH = 200
 
 class User(Base):
     __tablename__ = "users"
@@ -26,13 +30,22 @@ class ResumeDetails(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     file_name = Column(String, nullable=True)
     file_path = Column(String, nullable=True)
-    resume_text = Column(Text, nullable=True)
+    # zstd-compressed and deferred: only loaded when the attribute is accessed
+    resume_text = deferred(Column(CompressedText, nullable=True))
+    resume_preview = Column(String(RESUME_PREVIEW_LENGTH), nullable=True)
+    # SHA-256 of the uploaded PDF; set only while resume_text is that file's extracted text
+    content_hash = Column(String(64), index=True, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationship with User
     user = relationship("User", back_populates="resumes")
 
+    @validates("resume_text")
+    def _set_preview(self, key, value):
+        self.resume_preview = value[:RESUME_PREVIEW_LENGTH] if value else None
+        return value
+
 
 class ResumeCritique(Base):
     __tablename__ = "resume_critiques"
@@ -42,6 +55,10 @@ class ResumeCritique(Base):
     resume_id = Column(Integer, ForeignKey("resume_details.resume_id"), nullable=False)
     # Store the parsed critique structure
     review = Column(JSONB, nullable=False)
+    # Cache key: hash(resume_text, prompt version, model name, compaction settings)
+    content_hash = Column(String(64), index=True, nullable=True)
+    prompt_version = Column(String, nullable=True)
+    model_name = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User")
@@ -89,3 +106,80 @@ class UserCurrentState(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     user = relationship("User")
+
+
+class JobSkillExtraction(Base):
+    __tablename__ = "job_skill_extractions"
+    __table_args__ = (
+        UniqueConstraint("job_id", "description_hash", name="uq_job_skill_extractions_job_hash"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    job_id = Column(String, index=True, nullable=False)
+    # sha256 of the job description the skills were extracted from
+    description_hash = Column(String(64), nullable=False)
+    prompt_version = Column(String, nullable=False)
+    source = Column(String, nullable=False, default="llm")
+    skills = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class LearningPlanJob(Base):
+    __tablename__ = "learning_plan_jobs"
+
+    plan_id = Column(String(36), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    resume_id = Column(Integer, ForeignKey("resume_details.resume_id"), nullable=False)
+    # queued -> running -> completed | failed
+    status = Column(String, nullable=False, default="queued", index=True)
+    # LearningPlanRequest parameters the job was submitted with
+    request = Column(JSONB, nullable=False)
+    # LearningPlanResponse once completed
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    user = relationship("User")
+    resume = relationship("ResumeDetails")
+
+
+class LearningPlan(Base):
+    __tablename__ = "learning_plans"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # Hash of (critique, job analysis, plan parameters, prompt version, model name)
+    cache_key = Column(String(64), unique=True, index=True, nullable=False)
+    plan_id = Column(String(36), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resume_details.resume_id"), nullable=False, index=True)
+    critique_id = Column(Integer, ForeignKey("resume_critiques.id"), nullable=False)
+    analysis_id = Column(Integer, ForeignKey("jobfit_analyses.id"), nullable=False)
+    timeline_months = Column(Integer, nullable=False)
+    experience_level = Column(String, nullable=False)
+    rag_enabled = Column(Boolean, nullable=False, default=False)
+    prompt_version = Column(String, nullable=False)
+    # LearningPlanResponse as returned to the client
+    plan = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    resume = relationship("ResumeDetails")
+
+
+class ChatMessage(Base):
+    """Append-only copy of chat turns, so history can be paged without loading the checkpoint"""
+    __tablename__ = "chat_messages"
+    __table_args__ = (
+        UniqueConstraint("thread_id", "seq", name="uq_chat_messages_thread_seq"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    thread_id = Column(String, nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Position of the message in the thread's checkpointed message list
+    seq = Column(Integer, nullable=False)
+    role = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
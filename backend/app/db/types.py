@@ -0,0 +1,36 @@
+from typing import Optional
+
+import zstandard
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+# Every zstd frame starts with these bytes; anything else is plain UTF-8 from before compression
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZSTD_LEVEL = 6
+
+
+def compress_text(value: str) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(value.encode("utf-8"))
+
+
+def decompress_text(value: bytes) -> str:
+    value = bytes(value)
+    if value.startswith(ZSTD_MAGIC):
+        value = zstandard.ZstdDecompressor().decompress(value)
+    return value.decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """Text stored zstd-compressed in a bytea column.
+
+    Reads also accept uncompressed UTF-8 bytes, so rows converted with a plain
+    ``ALTER COLUMN ... TYPE bytea`` stay readable until they are recompressed.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        return compress_text(value) if value is not None else None
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        return decompress_text(value) if value is not None else None
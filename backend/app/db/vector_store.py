@@ -1,64 +1,96 @@
 import os
-from typing import Optional, List
-from uuid import uuid4
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from langchain_community.vectorstores import Chroma
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from app.external import embeddings
 from app.constents import VECTOR_DB_ROOT_PATH
 
+# One collection for every user's resume chunks, filtered by user_id/resume_id metadata
+RESUME_COLLECTION = "resume_chunks"
 
 os.makedirs(VECTOR_DB_ROOT_PATH, exist_ok=True)
 
-def build_chroma_from_text(resume_text: str, collection_name: Optional[str]) -> Chroma:
-    """Create an in-memory Chroma vector store from a resume text.
+_splitter = RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=100)
+_resume_store: Optional[Chroma] = None
+_resume_store_lock = threading.Lock()
 
-    Args:
-        resume_text: The raw resume text to index.
-        collection_name: Optional collection name; autogenerated if not provided.
 
-    Returns:
-        A Chroma vector store instance with embedded chunks of the provided text.
-    """
+def get_resume_store() -> Chroma:
+    """The shared resume chunk collection (opened once per process)."""
+    global _resume_store
+    if _resume_store is None:
+        with _resume_store_lock:
+            if _resume_store is None:
+                _resume_store = Chroma(
+                    collection_name=RESUME_COLLECTION,
+                    embedding_function=embeddings,
+                    persist_directory=str(VECTOR_DB_ROOT_PATH),
+                )
+    return _resume_store
 
-    splitter = RecursiveCharacterTextSplitter(chunk_size=800, chunk_overlap=100)
-    chunks: List[str] = splitter.split_text(resume_text)
 
-    persist_directory = VECTOR_DB_ROOT_PATH / collection_name
-    vector_db = Chroma(
-        collection_name=collection_name, 
-        embedding_function=embeddings,
-        persist_directory=str(persist_directory)
-    )
+def resume_filter(user_id: int, resume_id: Optional[int] = None) -> Dict[str, Any]:
+    """Chroma ``where`` clause limiting a search to one user's (or one resume's) chunks."""
+    if resume_id is None:
+        return {"user_id": user_id}
+    return {"$and": [{"user_id": user_id}, {"resume_id": resume_id}]}
+
+
+def delete_resume_chunks(resume_id: int) -> None:
+    """Remove every chunk of a resume from the shared collection."""
+    store = get_resume_store()
+    ids = store.get(where={"resume_id": resume_id}, include=[])["ids"]
+    if ids:
+        store.delete(ids=ids)
 
-    if chunks:
-        doc_id = uuid4().hex
-        chunk_ids = [f"{doc_id}_chunk_{i}" for i in range(len(chunks))]
-        vector_db.add_texts(texts=chunks, ids=chunk_ids)
-        vector_db.persist()
 
-    return vector_db
+def index_resumes(resumes: Iterable[Tuple[int, int, str]]) -> int:
+    """Chunk and embed (user_id, resume_id, resume_text) triples in one batch.
+
+    Existing chunks of those resumes are replaced, so re-indexing an edited
+    resume is safe. Returns the number of chunks written.
+    """
+    texts: List[str] = []
+    metadatas: List[Dict[str, Any]] = []
+    ids: List[str] = []
+    for user_id, resume_id, resume_text in resumes:
+        delete_resume_chunks(resume_id)
+        for i, chunk in enumerate(_splitter.split_text(resume_text or "")):
+            texts.append(chunk)
+            metadatas.append({"user_id": user_id, "resume_id": resume_id, "chunk": i})
+            ids.append(f"resume-{resume_id}-{i}")
+
+    if texts:
+        get_resume_store().add_texts(texts=texts, metadatas=metadatas, ids=ids)
+    return len(texts)
 
 
-def get_vector_db(collection_name: str) -> Optional[Chroma]:
-    """Get a vector database by collection name."""
-    persist_directory = os.path.join(VECTOR_DB_ROOT_PATH, collection_name)
-    
-    if not persist_directory.exists():
-        return None
-        
+def index_resume(user_id: int, resume_id: int, resume_text: str) -> int:
+    """Index a single resume; errors are logged, as indexing runs in the background."""
     try:
-        return Chroma(
-            collection_name=collection_name, 
-            embedding_function=embeddings, 
-            persist_directory=str(persist_directory)
-        )
+        return index_resumes([(user_id, resume_id, resume_text)])
     except Exception as e:
-        print(f"Error loading vector DB {collection_name}: {e}")
-        return None
+        print(f"Failed to index resume {resume_id}: {e}")
+        return 0
 
-def get_mmr_retriever(vector_db: Chroma, k: int = 2, lambda_mult: float = 0.5):
-    """Return an MMR retriever for the given vector DB."""
-    return vector_db.as_retriever(
+
+def unindex_resume(resume_id: int) -> None:
+    """Drop a deleted resume's chunks; errors are logged, as this runs in the background."""
+    try:
+        delete_resume_chunks(resume_id)
+    except Exception as e:
+        print(f"Failed to remove resume {resume_id} from the index: {e}")
+
+
+def get_mmr_retriever(user_id: int, resume_id: Optional[int] = None, k: int = 2, lambda_mult: float = 0.5):
+    """Return an MMR retriever over one user's resume chunks (optionally a single resume)."""
+    return get_resume_store().as_retriever(
         search_type="mmr",
-        search_kwargs={"k": k, "lambda_mult": lambda_mult},
-    )
\ No newline at end of file
+        search_kwargs={
+            "k": k,
+            "fetch_k": max(20, k * 4),
+            "lambda_mult": lambda_mult,
+            "filter": resume_filter(user_id, resume_id),
+        },
+    )
@@ -1,4 +1,5 @@
 from .llm_clients.openai_client import llm
 from .llm_clients.openai_embeddings import embeddings
+from .llm_clients.llm_gateway import llm_gateway
 
-__all__ = ["llm", "embeddings"]
+__all__ = ["llm", "embeddings", "llm_gateway"]
@@ -0,0 +1,409 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import openai
+from langchain_core.language_models import BaseChatModel, LanguageModelInput
+from langchain_core.messages import BaseMessage, BaseMessageChunk
+from langchain_core.runnables import RunnableConfig, RunnableLambda, ensure_config
+
+from app.core.config import settings
+from .openai_client import llm
+
+# Errors worth retrying: timeouts, dropped connections, throttling and 5xx responses
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the provider circuit breaker is open and calls fail fast."""
+
+
+class TokenBucket:
+    """Async token bucket limiting the request rate to a provider."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Take one token, waiting if necessary."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single trial call through after a cool-down."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Release a half-open trial slot without judging provider health (e.g. on a 4xx or cancellation)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class HedgeBudget:
+    """Caps hedged requests to a fraction of primary requests.
+
+    Every primary call earns ``ratio`` of a credit (up to ``burst``); firing a
+    hedge spends one, so at most ~ratio extra requests are sent on average.
+    """
+
+    def __init__(self, ratio: float, burst: float):
+        self.ratio = ratio
+        self.burst = burst
+        self.credits = burst
+
+    def earn(self) -> None:
+        self.credits = min(self.burst, self.credits + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.credits >= 1:
+            self.credits -= 1
+            return True
+        return False
+
+
+class LLMMetrics:
+    """Rolling per-call latency and token counters."""
+
+    def __init__(self, window: int = 1000):
+        self.latencies: deque = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.hedges_skipped = 0
+        self.hedges_skipped_callbacks = 0
+        self.last_hedge_delay: Optional[float] = None
+        self.last_call: Dict[str, Any] = {}
+
+    def record_call(self, latency: float, queue_wait: float, message: Optional[BaseMessage]) -> None:
+        self.calls += 1
+        self.latencies.append(latency)
+        usage = getattr(message, "usage_metadata", None) or {}
+        prompt_tokens = usage.get("input_tokens", 0)
+        completion_tokens = usage.get("output_tokens", 0)
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        self.last_call = {
+            "latency_ms": round(latency * 1000, 1),
+            "queue_wait_ms": round(queue_wait * 1000, 1),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        }
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_p50_ms": ms(self.percentile(50)),
+            "latency_p95_ms": ms(self.percentile(95)),
+            "latency_p99_ms": ms(self.percentile(99)),
+            "hedges": {
+                "fired": self.hedges_fired,
+                "won": self.hedges_won,
+                "skipped_budget": self.hedges_skipped,
+                "skipped_callbacks": self.hedges_skipped_callbacks,
+                "last_delay_ms": ms(self.last_hedge_delay),
+            },
+            "last_call": self.last_call,
+        }
+
+
+class LLMGateway:
+    """Async-only entry point for every chat-model call.
+
+    Wraps a LangChain chat model with a per-provider token bucket, a concurrency
+    semaphore, per-call timeouts, jittered exponential-backoff retries and a
+    circuit breaker, and records latency/token metrics for each call.
+
+    With LLM_HEDGE_ENABLED, a non-streaming call that has not returned within the
+    recent LLM_HEDGE_PERCENTILE latency is duplicated and the first answer wins;
+    a hedge budget limits how many extra requests that may cost. Calls that
+    report to callbacks (LangGraph token streaming, tracing) are never hedged,
+    since both attempts would emit tokens and runs to the same handlers.
+    """
+
+    def __init__(self, client: BaseChatModel, provider: str):
+        self.client = client
+        self.provider = provider
+        self.timeout = settings.LLM_TIMEOUT_SECONDS
+        self.max_retries = settings.LLM_MAX_RETRIES
+        self.bucket = TokenBucket(settings.LLM_RATE_PER_SECOND, settings.LLM_BURST)
+        self.semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        self.breaker = CircuitBreaker(settings.LLM_BREAKER_FAILURE_THRESHOLD, settings.LLM_BREAKER_RESET_SECONDS)
+        self.metrics = LLMMetrics()
+        self.hedge_budget = HedgeBudget(settings.LLM_HEDGE_BUDGET_RATIO, settings.LLM_HEDGE_BUDGET_BURST)
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter" exponential backoff
+        ceiling = min(settings.LLM_RETRY_MAX_DELAY, settings.LLM_RETRY_BASE_DELAY * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def _check_breaker(self) -> None:
+        if not self.breaker.allow():
+            self.metrics.rejected += 1
+            raise CircuitOpenError(f"LLM provider '{self.provider}' is unavailable (circuit open)")
+
+    async def _call_once(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig],
+        kwargs: Dict[str, Any],
+        dispatched: Optional[asyncio.Event] = None,
+    ) -> Tuple[BaseMessage, float, float]:
+        """One rate-limited provider request. Returns (message, latency, queue wait)."""
+        admitted = time.monotonic()
+        await self.bucket.acquire()
+        async with self.semaphore:
+            started = time.monotonic()
+            if dispatched is not None:
+                dispatched.set()
+            message = await asyncio.wait_for(
+                self.client.ainvoke(input, config=config, **kwargs),
+                timeout=self.timeout,
+            )
+        return message, time.monotonic() - started, started - admitted
+
+    @staticmethod
+    def _has_callbacks(config: Optional[RunnableConfig]) -> bool:
+        """Whether a call would report to callback handlers, including ones inherited from
+        the enclosing runnable (e.g. a LangGraph node streaming with stream_mode="messages")."""
+        callbacks = ensure_config(config).get("callbacks")
+        if callbacks is None:
+            return False
+        if isinstance(callbacks, list):
+            return bool(callbacks)
+        return bool(callbacks.handlers)
+
+    def _hedge_delay(self) -> Optional[float]:
+        """How long to wait before hedging, or None while there is too little latency history."""
+        if len(self.metrics.latencies) < settings.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return max(settings.LLM_HEDGE_MIN_DELAY_SECONDS, self.metrics.percentile(settings.LLM_HEDGE_PERCENTILE))
+
+    async def _call_hedged(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig],
+        kwargs: Dict[str, Any],
+    ) -> Tuple[BaseMessage, float, float]:
+        """Issue a request, duplicating it once if it is slower than the hedge delay."""
+        self.hedge_budget.earn()
+        dispatched = asyncio.Event()
+        primary = asyncio.create_task(self._call_once(input, config, kwargs, dispatched))
+        tasks = {primary}
+        try:
+            delay = self._hedge_delay()
+            if delay is None:
+                return await primary
+
+            # The hedge timer starts when the request reaches the provider, not while it queues locally
+            waiter = asyncio.create_task(dispatched.wait())
+            await asyncio.wait({primary, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+            if not self.hedge_budget.try_spend():
+                self.metrics.hedges_skipped += 1
+                return await primary
+
+            self.metrics.hedges_fired += 1
+            self.metrics.last_hedge_delay = delay
+            hedge = asyncio.create_task(self._call_once(input, config, kwargs))
+            tasks.add(hedge)
+
+            # First success wins; if both fail, surface the primary's error
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.metrics.hedges_won += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # the losing attempt's error is expected; mark it retrieved
+
+    async def ainvoke(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> BaseMessage:
+        """Invoke the chat model with rate limiting, timeout, retries, optional hedging and metrics."""
+        attempt = 0
+        while True:
+            self._check_breaker()
+            hedge = settings.LLM_HEDGE_ENABLED
+            if hedge and self._has_callbacks(config):
+                self.metrics.hedges_skipped_callbacks += 1
+                hedge = False
+            try:
+                if hedge:
+                    message, latency, queue_wait = await self._call_hedged(input, config, kwargs)
+                else:
+                    message, latency, queue_wait = await self._call_once(input, config, kwargs)
+            except RETRYABLE_ERRORS:
+                self.breaker.record_failure()
+                self.metrics.errors += 1
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.metrics.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except Exception:
+                self.breaker.release()
+                self.metrics.errors += 1
+                raise
+            except BaseException:
+                self.breaker.release()
+                raise
+
+            self.breaker.record_success()
+            self.metrics.record_call(latency, queue_wait, message)
+            return message
+
+    async def astream(
+        self,
+        input: LanguageModelInput,
+        config: Optional[RunnableConfig] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[BaseMessageChunk]:
+        """Stream chat-model chunks; retries only happen before the first chunk is produced."""
+        attempt = 0
+        while True:
+            self._check_breaker()
+            admitted = time.monotonic()
+            await self.bucket.acquire()
+            emitted = False
+            aggregate: Optional[BaseMessageChunk] = None
+            try:
+                async with self.semaphore:
+                    started = time.monotonic()
+                    queue_wait = started - admitted
+                    stream = self.client.astream(input, config=config, **kwargs).__aiter__()
+                    while True:
+                        try:
+                            # Idle timeout between chunks rather than a whole-stream deadline
+                            chunk = await asyncio.wait_for(stream.__anext__(), timeout=self.timeout)
+                        except StopAsyncIteration:
+                            break
+                        aggregate = chunk if aggregate is None else aggregate + chunk
+                        emitted = True
+                        yield chunk
+            except RETRYABLE_ERRORS:
+                self.breaker.record_failure()
+                self.metrics.errors += 1
+                if emitted or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self.metrics.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except Exception:
+                self.breaker.release()
+                self.metrics.errors += 1
+                raise
+            except BaseException:
+                self.breaker.release()
+                raise
+
+            self.breaker.record_success()
+            self.metrics.record_call(time.monotonic() - started, queue_wait, aggregate)
+            return
+
+    def as_runnable(self) -> RunnableLambda:
+        """Runnable wrapper so the gateway can be piped into LCEL chains (async only)."""
+
+        async def _call(input: LanguageModelInput, config: RunnableConfig) -> BaseMessage:
+            return await self.ainvoke(input, config=config)
+
+        return RunnableLambda(_call, name=f"llm_gateway[{self.provider}]")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "circuit": self.breaker.state,
+            "in_flight": settings.LLM_MAX_CONCURRENCY - self.semaphore._value,
+            **self.metrics.snapshot(),
+        }
+
+
+llm_gateway = LLMGateway(llm, provider="a4f")
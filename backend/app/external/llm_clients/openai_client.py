@@ -1,16 +1,34 @@
 import os, getpass
+import httpx
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from app.core.config import settings
 
 load_dotenv()
 
 a4f_api_key = os.getenv("A4F_API_KEY")
 a4f_base_url = os.getenv("A4F_BASE_URL")
 
+if settings.LLM_STANDIN_URL:
+    a4f_base_url = settings.LLM_STANDIN_URL
+    a4f_api_key = a4f_api_key or "standin"
+
+# One keep-alive connection pool shared by every async LLM call in the process
+http_async_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+    ),
+    timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS),
+)
+
 llm = ChatOpenAI(
     model="provider-5/gpt-4.1-mini",
     tiktoken_model_name="gpt-4.1-mini",
     api_key=a4f_api_key,
     base_url=a4f_base_url, 
     temperature=0.5,
+    http_async_client=http_async_client,
+    # Retries are handled by the LLM gateway (jittered backoff + circuit breaker)
+    max_retries=0,
 )
@@ -1,11 +1,12 @@
 from langchain_openai import OpenAIEmbeddings
 from dotenv import load_dotenv
 import os
+from app.core.config import settings
 
 load_dotenv()
 
 # Initialize embedding model
 embeddings = OpenAIEmbeddings(model="provider-3/text-embedding-3-small",
-base_url=os.getenv("A4F_BASE_URL"),
-api_key=os.getenv("A4F_API_KEY")
+base_url=settings.LLM_STANDIN_URL or os.getenv("A4F_BASE_URL"),
+api_key=os.getenv("A4F_API_KEY") or ("standin" if settings.LLM_STANDIN_URL else None)
 )
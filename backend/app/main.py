@@ -2,16 +2,26 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
+from app.core.config import settings
+from app.core.request_limits import MULTIPART_OVERHEAD_BYTES, RequestSizeLimitMiddleware
 from app.core.database import async_db  # Import the global instance
+from app.services.learning_plan_queue import learning_plan_queue
+from app.services.pdf_extraction_pool import pdf_extraction_pool
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 1. Connect to Database
     await async_db.connect()
+    # 2. Start background learning plan workers (re-queues unfinished jobs)
+    await learning_plan_queue.start()
+    # 3. Spawn PDF extraction worker processes
+    await pdf_extraction_pool.start()
     
     yield
     
-    # 2. Disconnect on shutdown
+    # 4. Stop workers and disconnect on shutdown
+    await learning_plan_queue.stop()
+    pdf_extraction_pool.shutdown()
     await async_db.disconnect()
 
 app = FastAPI(
@@ -27,6 +37,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Upload size limits are enforced before FastAPI parses (and spools) the multipart body
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    limits={
+        "/api/v1/upload/pdf": settings.MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/v1/upload/bulk": settings.BULK_UPLOAD_MAX_BYTES,
+    },
+)
+
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from typing import Any, Optional
-from app.schemas.common import FileUploadResponse
+from typing import Any, Literal, Optional
+from app.schemas.common import FileUploadResponse, ResumeUploadResponse
 from app.schemas.common import PDFExtractionResponse
 from pydantic import BaseModel
 
@@ -11,9 +11,14 @@ class APIResponse(BaseModel):
 class FileUplaodAPIResponse(APIResponse):
     data: FileUploadResponse
 
+class ResumeUploadAPIResponse(APIResponse):
+    data: ResumeUploadResponse
+
 class PDFExtractionAPIResponse(APIResponse):
     data: PDFExtractionResponse
 
 class PDFExtractionAPIRequest(BaseModel):
     file_path: str
+    # pypdf text extraction mode; "layout" keeps the visual arrangement of columns
+    extraction_mode: Literal["plain", "layout"] = "plain"
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Any
+from typing import Optional, Any, List
 from datetime import datetime
 
 class MessageResponse(BaseModel):
@@ -15,12 +15,27 @@ class FileUploadResponse(BaseModel):
     path: str # TODO: need to remove this path instead use file name
     size:int
     created_at:datetime
+    sha256: Optional[str] = None
+    # True when an identical file was already stored and its blob was reused
+    duplicate: bool = False
+
+
+class ResumeUploadResponse(FileUploadResponse):
+    resume_id: int
+    pages_processed: Optional[int] = None
+    text_length: int
+    # First characters only; the full text is available from /resumes/{resume_id}
+    resume_preview: Optional[str] = None
+    # True when the text came from an earlier upload of the same file instead of re-extraction
+    reused_text: bool = False
 
 
 class PDFExtractionResponse(BaseModel):
     collection_name: str
     pages: int
     full_text: str
+    # Parse time per page in ms; None where the page text came from the page cache
+    page_timings_ms: List[Optional[float]] = []
 
 class QueryResponse(BaseModel):
     message: str
@@ -46,6 +46,7 @@ class LearningPlanRequest(BaseModel):
     experience_level: str = Field(default="intermediate", description="Current experience level")
     job_analysis_id: Optional[int] = Field(default=None, description="Specific job analysis to use, or None for latest")
     rag_enabled: bool = Field(default=False, description="Whether to attach resources via RAG")
+    regenerate: bool = Field(default=False, description="Ignore any stored plan for these inputs and generate a new one")
 
 
 class LearningPlanGenerateResponse(BaseModel):
@@ -53,3 +54,14 @@ class LearningPlanGenerateResponse(BaseModel):
     plan_id: str = Field(description="Unique plan identifier")
     status: str = Field(description="Generation status")
     estimated_completion: datetime = Field(description="When plan will be ready")
+
+
+class LearningPlanJobStatus(BaseModel):
+    """Status (and result, once completed) of an async learning plan job"""
+    plan_id: str = Field(description="Unique plan identifier")
+    status: str = Field(description="queued, running, completed or failed")
+    created_at: Optional[datetime] = Field(default=None, description="When the job was submitted")
+    started_at: Optional[datetime] = Field(default=None, description="When a worker picked the job up")
+    completed_at: Optional[datetime] = Field(default=None, description="When the job finished")
+    error: Optional[str] = Field(default=None, description="Failure reason if status is failed")
+    result: Optional[LearningPlanResponse] = Field(default=None, description="Generated plan if status is completed")
@@ -21,3 +21,16 @@ class ResumeDetails(ResumeDetailsBase):
 
     class Config:
         from_attributes = True
+
+class ResumeDetailsSummary(BaseModel):
+    """List view of a resume: metadata and a short preview, never the full text"""
+    resume_id: int
+    user_id: int
+    file_name: Optional[str] = None
+    file_path: Optional[str] = None
+    resume_preview: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langgraph.graph import MessagesState
+
+from app.core.config import settings
+from app.external import llm_gateway
+
+
+class SummarizedMessagesState(MessagesState, total=False):
+    """Chat state with a rolling summary of the turns no longer sent verbatim."""
+    summary: str
+    # Number of leading messages already folded into ``summary``
+    summarized_upto: int
+
+
+class ConversationMemory:
+    """Memory policy: the last ``keep_turns`` turns verbatim, older turns as a running summary.
+
+    ``build_context`` is what a graph node sends to the model. Once
+    ``summarize_every`` more turns than ``keep_turns`` are unsummarized,
+    ``schedule_summary`` folds the oldest of them into the summary in a
+    background task, after the reply has already been produced, and writes the
+    result back into the checkpoint with ``aupdate_state``. Callers name the
+    checkpoint store they use (``/chat`` and ``/query`` keep separate histories
+    that can share a thread id), so the one-run-per-thread guard is per store.
+    """
+
+    def __init__(self, keep_turns: int = 6, summarize_every: int = 4):
+        self.keep_turns = max(1, keep_turns)
+        self.summarize_every = max(1, summarize_every)
+        self._running: Set[Tuple[str, str]] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def build_context(self, state: Dict[str, Any]) -> List[BaseMessage]:
+        messages = state["messages"]
+        context = list(messages[state.get("summarized_upto", 0):])
+        summary = state.get("summary")
+        if summary:
+            context.insert(0, SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+        return context
+
+    def _fold_until(self, state: Dict[str, Any]) -> Optional[int]:
+        """Index up to which messages should be folded, or None if no summary is due yet."""
+        messages = state.get("messages", [])
+        start = state.get("summarized_upto", 0)
+        turn_starts = [i for i in range(start, len(messages)) if isinstance(messages[i], HumanMessage)]
+        if len(turn_starts) < self.keep_turns + self.summarize_every:
+            return None
+        return turn_starts[-self.keep_turns]
+
+    def schedule_summary(self, graph: Any, config: Dict[str, Any], as_node: str, store: str) -> None:
+        """Fold old turns into the summary off the request path (at most one run per thread and store)."""
+        key = (store, config["configurable"]["thread_id"])
+        if key in self._running:
+            return
+        self._running.add(key)
+        task = asyncio.create_task(self._summarize(graph, config, as_node))
+        self._tasks.add(task)
+
+        def _done(t: asyncio.Task) -> None:
+            self._tasks.discard(t)
+            self._running.discard(key)
+
+        task.add_done_callback(_done)
+
+    async def _summarize(self, graph: Any, config: Dict[str, Any], as_node: str) -> None:
+        try:
+            snapshot = await graph.aget_state(config)
+            state = snapshot.values
+            fold_until = self._fold_until(state)
+            if fold_until is None:
+                return
+
+            start = state.get("summarized_upto", 0)
+            transcript = "\n".join(
+                f"{'User' if m.type == 'human' else 'Assistant'}: {m.content}"
+                for m in state["messages"][start:fold_until]
+                if m.type in ("human", "ai") and m.content
+            )
+            previous = state.get("summary") or "(none yet)"
+            response = await llm_gateway.ainvoke([
+                SystemMessage(content=(
+                    "You maintain a running summary of a conversation between a user and a career assistant. "
+                    "Merge the new lines into the existing summary. Keep facts about the user (background, skills, "
+                    "goals, target roles), decisions and open questions; drop pleasantries. "
+                    "Reply with the updated summary only, at most 200 words."
+                )),
+                HumanMessage(content=f"Existing summary:\n{previous}\n\nNew lines:\n{transcript}"),
+            ])
+
+            await graph.aupdate_state(
+                config,
+                {"summary": response.content.strip(), "summarized_upto": fold_until},
+                as_node=as_node,
+            )
+        except Exception as e:
+            # The next turn simply sends more verbatim history and tries again
+            print(f"Conversation summary failed for thread {config['configurable'].get('thread_id')}: {e}")
+
+
+chat_memory = ConversationMemory(
+    keep_turns=settings.CHAT_MEMORY_KEEP_TURNS,
+    summarize_every=settings.CHAT_MEMORY_SUMMARIZE_EVERY,
+)
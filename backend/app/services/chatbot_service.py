@@ -1,16 +1,34 @@
-from typing import Annotated, List, TypedDict, Dict, Any
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from typing import Annotated, AsyncIterator, List, NotRequired, Optional, Sequence, TypedDict, Dict, Any
+from langchain_core.messages import AIMessageChunk, BaseMessage, HumanMessage, AIMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph, add_messages, START, END
-from app.external import llm
+from app.external import llm_gateway
+from app.core.config import settings
 from app.core.database import async_db  # <--- Import the global DB instance
+from app.db.vector_store import get_mmr_retriever
+from app.core.streaming import relay_in_background
+from app.services.chat_memory import chat_memory
+
+# chat_messages row recording that a thread's checkpoint has been copied into the table
+BACKFILL_MARKER_SEQ = -1
+BACKFILL_MARKER_ROLE = "backfilled"
 
 # --- Define Graph Logic ---
 class ChatState(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
+    # Rolling summary of older turns (see chat_memory)
+    summary: NotRequired[str]
+    summarized_upto: NotRequired[int]
 
-def call_llm(state: ChatState) -> Dict[str, List[AIMessage]]:
-    messages = state["messages"]
-    response = llm.invoke(messages)
+async def call_llm(state: ChatState, config: RunnableConfig) -> Dict[str, List[AIMessage]]:
+    messages = chat_memory.build_context(state)
+    # Retrieved resume chunks ride along in the run config; as a list (not a str) they are
+    # also kept out of the checkpoint metadata, which copies primitive configurable values
+    resume_chunks = config.get("configurable", {}).get("resume_chunks")
+    if resume_chunks:
+        excerpts = "\n---\n".join(resume_chunks)
+        messages.insert(0, SystemMessage(content=f"Relevant excerpts from the user's resume:\n{excerpts}"))
+    response = await llm_gateway.ainvoke(messages, config=config)
     return {"messages": [response]}
 
 workflow = StateGraph(ChatState)
@@ -19,52 +37,177 @@ workflow.add_edge(START, "chatbot")
 workflow.add_edge("chatbot", END)
 
 class ChatBotService:
-    # No __init__ needed for pool anymore
-    
-    # We removed the 'initialize' method because we don't need to inject the pool manually.
+    def __init__(self):
+        # Compiled once; each run gets a copy bound to its own checkpointer (see get_graph)
+        self._graph = workflow.compile()
+
+    def get_graph(self):
+        """The chat graph with a fresh pool-backed checkpointer, for a single run.
+
+        Copying the compiled graph is cheap (tens of microseconds), and a saver per
+        run means concurrent chats no longer queue on one saver's internal lock.
+        """
+        return self._graph.copy(update={"checkpointer": async_db.get_checkpointer()})
+
+    async def retrieve_resume_chunks(self, user_id: int, resume_id: Optional[int], message: str) -> List[str]:
+        """Top resume chunks for the message (MMR over the user's chunks); empty when RAG is off."""
+        if not settings.RESUME_RAG_ENABLED or resume_id is None:
+            return []
+        try:
+            retriever = get_mmr_retriever(
+                user_id, resume_id, k=settings.RESUME_RAG_K, lambda_mult=settings.RESUME_RAG_LAMBDA_MULT
+            )
+            documents = await retriever.ainvoke(message)
+        except Exception as e:
+            # Answer without resume context rather than failing the chat turn
+            print(f"Resume retrieval failed for resume {resume_id}: {e}")
+            return []
+        return [doc.page_content for doc in documents]
+
+    async def generate_response(
+        self, user_id: int, thread_id: str, message: str, resume_id: Optional[int] = None
+    ) -> str:
+        """
+        Executes the compiled graph; DB connections are only held for checkpoint reads/writes.
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        resume_chunks = await self.retrieve_resume_chunks(user_id, resume_id, message)
+        if resume_chunks:
+            config["configurable"]["resume_chunks"] = resume_chunks
+        input_messages = [HumanMessage(content=message)]
+
+        graph = self.get_graph()
+        result = await graph.ainvoke(
+            {"messages": input_messages},
+            config=config
+        )
+        chat_memory.schedule_summary(graph, config, as_node="chatbot", store="chat")
+        await self.record_messages(user_id, thread_id, result["messages"], start=len(result["messages"]) - 2)
+
+        return result["messages"][-1].content
     
-    async def generate_response(self, user_id: int, thread_id: str, message: str) -> str:
+    async def stream_response(
+        self, user_id: int, thread_id: str, message: str, resume_id: Optional[int] = None
+    ) -> AsyncIterator[str]:
         """
-        Executes the graph using the global async_db pool.
+        Streams model tokens as they are generated.
+
+        The graph runs in a detached task, so the checkpointer still persists the
+        final AI message even if the client disconnects mid-stream.
         """
-        # We use the helper method from your database.py
-        # This handles the connection and checkpointer creation automatically
-        async for checkpointer in async_db.get_checkpointer():
-            
-            # 1. Compile the graph with this specific connection/checkpointer
-            app_graph = workflow.compile(checkpointer=checkpointer)
-            
-            # 2. Config
+        async def run_graph() -> AsyncIterator[str]:
             config = {"configurable": {"thread_id": thread_id}}
-            input_messages = [HumanMessage(content=message)]
-            
-            # 3. Invoke
-            result = await app_graph.ainvoke(
-                {"messages": input_messages}, 
-                config=config
-            )
-            
-            return result["messages"][-1].content
-    
-    async def get_chat_history(self, user_id: int, thread_id: str) -> List[Dict[str, Any]]:
-        config = {"configurable": {"thread_id": thread_id}}
-        
-        # FIX 1: Change 'async with' to 'async for'
-        async for checkpointer in async_db.get_checkpointer():
-            
-            # Note: Ensure you use .aget (async get)
-            snapshot = await checkpointer.aget(config)
-            
-            if not snapshot:
-                return []
-
-            raw_messages = snapshot['channel_values']['messages']
-            
-            clean_history = []
-            for msg in raw_messages:
-                clean_history.append({
-                    "role": msg.type,
-                    "content": msg.content,
-                })
-            
-            return clean_history
\ No newline at end of file
+            resume_chunks = await self.retrieve_resume_chunks(user_id, resume_id, message)
+            if resume_chunks:
+                config["configurable"]["resume_chunks"] = resume_chunks
+
+            graph = self.get_graph()
+            async for chunk, metadata in graph.astream(
+                {"messages": [HumanMessage(content=message)]},
+                config=config,
+                stream_mode="messages",
+            ):
+                if isinstance(chunk, AIMessageChunk) and metadata.get("langgraph_node") == "chatbot" and chunk.content:
+                    yield chunk.content
+
+            chat_memory.schedule_summary(graph, config, as_node="chatbot", store="chat")
+            snapshot = await graph.aget_state(config)
+            messages = snapshot.values.get("messages", [])
+            await self.record_messages(user_id, thread_id, messages, start=len(messages) - 2)
+
+        async for token in relay_in_background(run_graph):
+            yield token
+
+    async def record_messages(
+        self, user_id: Optional[int], thread_id: str, messages: Sequence[BaseMessage], start: int = 0
+    ) -> bool:
+        """Append messages[start:] to chat_messages, keyed by their position in the thread.
+
+        Returns False if the rows could not be written.
+        """
+        rows = [
+            (thread_id, user_id, seq, msg.type, msg.content)
+            for seq, msg in enumerate(messages)
+            if seq >= max(start, 0) and msg.type in ("human", "ai") and isinstance(msg.content, str)
+        ]
+        return await self._insert_rows(thread_id, rows)
+
+    async def _insert_rows(self, thread_id: str, rows: List[tuple]) -> bool:
+        if not rows:
+            return True
+        try:
+            async with async_db.pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.executemany(
+                        """
+                        INSERT INTO chat_messages (thread_id, user_id, seq, role, content)
+                        VALUES (%s, %s, %s, %s, %s)
+                        ON CONFLICT (thread_id, seq) DO NOTHING
+                        """,
+                        rows,
+                    )
+        except Exception as e:
+            # History can always be rebuilt from the checkpoint, so never fail the chat turn
+            print(f"Failed to record chat messages for thread {thread_id}: {e}")
+            return False
+        return True
+
+    async def _backfill_history(self, user_id: int, thread_id: str) -> None:
+        """Copy a thread's checkpointed messages into chat_messages, once per thread.
+
+        Covers threads that predate the table and fills any gaps left by failed
+        writes. A marker row records that the copy happened, so later reads never
+        load the checkpoint again (even for threads whose first message is not seq 0).
+        Threads that already have rows belonging to another user are left alone.
+        """
+        async with async_db.pool.connection() as conn:
+            foreign = await (await conn.execute(
+                "SELECT 1 FROM chat_messages WHERE thread_id = %s AND user_id IS DISTINCT FROM %s LIMIT 1",
+                (thread_id, user_id),
+            )).fetchone()
+        if foreign:
+            return
+
+        snapshot = await async_db.get_checkpointer().aget({"configurable": {"thread_id": thread_id}})
+        messages = snapshot["channel_values"].get("messages", []) if snapshot else []
+        if await self.record_messages(user_id, thread_id, messages):
+            await self._insert_rows(thread_id, [(thread_id, user_id, BACKFILL_MARKER_SEQ, BACKFILL_MARKER_ROLE, "")])
+
+    async def get_chat_history(
+        self, user_id: int, thread_id: str, before: Optional[int] = None, limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        One page of a thread's messages, oldest first, ending just before ``before``.
+
+        Only the requested window is read from chat_messages; ``next_cursor`` is the
+        ``before`` value for the previous (older) page. The backfill marker sorts
+        below every message, so it shows up whenever a read reaches the thread's start.
+        Only rows written for ``user_id`` are returned.
+        """
+        query = """
+            SELECT seq, role, content FROM chat_messages
+            WHERE thread_id = %(thread_id)s AND user_id = %(user_id)s
+              AND (%(before)s::int IS NULL OR seq < %(before)s::int)
+            ORDER BY seq DESC
+            LIMIT %(limit)s
+        """
+        params = {"thread_id": thread_id, "user_id": user_id, "before": before, "limit": limit + 1}
+
+        async with async_db.pool.connection() as conn:
+            rows = await (await conn.execute(query, params)).fetchall()
+
+        # Reached the start of the table's copy without finding the marker: copy the checkpoint once
+        if len(rows) <= limit and (not rows or rows[-1]["seq"] != BACKFILL_MARKER_SEQ):
+            await self._backfill_history(user_id, thread_id)
+            async with async_db.pool.connection() as conn:
+                rows = await (await conn.execute(query, params)).fetchall()
+
+        rows = [row for row in rows if row["seq"] != BACKFILL_MARKER_SEQ]
+        has_more = len(rows) > limit
+        page = list(reversed(rows[:limit]))
+
+        return {
+            "messages": [{"role": row["role"], "content": row["content"], "seq": row["seq"]} for row in page],
+            "next_cursor": page[0]["seq"] if has_more else None,
+            "has_more": has_more,
+        }
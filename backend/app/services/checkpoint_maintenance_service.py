@@ -0,0 +1,144 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.database import engine
+
+CHECKPOINT_TABLES = ("checkpoints", "checkpoint_writes", "checkpoint_blobs")
+
+# Checkpoints of the selected threads ranked newest first per (thread, namespace).
+# Checkpoint ids are time-ordered UUIDs, the same ordering LangGraph uses for "latest".
+_RANKED_CHECKPOINTS = """
+    SELECT thread_id, checkpoint_ns, checkpoint_id, checkpoint,
+           row_number() OVER (PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC) AS rn
+    FROM checkpoints
+    WHERE thread_id = ANY(:thread_ids)
+"""
+
+_STALE_CHECKPOINTS = f"""
+    SELECT thread_id, checkpoint_ns, checkpoint_id FROM ({_RANKED_CHECKPOINTS}) ranked WHERE rn > :keep
+"""
+
+# Oldest channel version any kept checkpoint still references. Blobs below it are
+# unreachable; newer blobs (e.g. from a turn being written right now) are never touched.
+_MIN_KEPT_VERSIONS = f"""
+    SELECT ranked.thread_id, ranked.checkpoint_ns, cv.key AS channel, MIN(cv.value) AS min_version
+    FROM ({_RANKED_CHECKPOINTS}) ranked,
+         jsonb_each_text(ranked.checkpoint -> 'channel_versions') cv
+    WHERE ranked.rn <= :keep
+    GROUP BY ranked.thread_id, ranked.checkpoint_ns, cv.key
+"""
+
+_TARGETS = {
+    "checkpoint_writes": (
+        "checkpoint_writes t",
+        f"""(t.thread_id, t.checkpoint_ns, t.checkpoint_id) IN ({_STALE_CHECKPOINTS})""",
+    ),
+    "checkpoints": (
+        "checkpoints t",
+        f"""(t.thread_id, t.checkpoint_ns, t.checkpoint_id) IN ({_STALE_CHECKPOINTS})""",
+    ),
+    "checkpoint_blobs": (
+        "checkpoint_blobs t",
+        f"""EXISTS (
+            SELECT 1 FROM ({_MIN_KEPT_VERSIONS}) k
+            WHERE k.thread_id = t.thread_id AND k.checkpoint_ns = t.checkpoint_ns
+              AND k.channel = t.channel AND t.version < k.min_version
+        )""",
+    ),
+}
+
+
+class CheckpointMaintenanceService:
+    """Retention for the LangGraph Postgres checkpoint tables.
+
+    Keeps the newest ``keep`` checkpoints of every thread, deletes (or moves to
+    ``<table>_archive``) older checkpoints, their pending writes and the channel
+    blobs no kept checkpoint can reach. Threads are processed in batches, one
+    transaction per batch, so the job can be interrupted and re-run safely.
+    """
+
+    def __init__(self, keep: int = 1, batch_size: int = 200, archive: bool = False, dry_run: bool = False):
+        self.keep = max(1, keep)
+        self.batch_size = max(1, batch_size)
+        self.archive = archive
+        self.dry_run = dry_run
+
+    def list_threads(self, conn: Connection) -> List[str]:
+        """Threads with more than ``keep`` checkpoints in any namespace."""
+        rows = conn.execute(
+            text("""
+                SELECT DISTINCT thread_id FROM checkpoints
+                GROUP BY thread_id, checkpoint_ns
+                HAVING count(*) > :keep
+                ORDER BY thread_id
+            """),
+            {"keep": self.keep},
+        )
+        return [row[0] for row in rows]
+
+    def _ensure_archive_tables(self, conn: Connection) -> None:
+        for table in CHECKPOINT_TABLES:
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_archive (LIKE {table})"))
+
+    def _compact_table(self, conn: Connection, table: str, thread_ids: List[str]) -> Dict[str, int]:
+        source, condition = _TARGETS[table]
+        params = {"thread_ids": thread_ids, "keep": self.keep}
+
+        if self.dry_run:
+            statement = f"SELECT count(*), COALESCE(sum(pg_column_size(t.*)), 0) FROM {source} WHERE {condition}"
+        elif self.archive:
+            statement = f"""
+                WITH removed AS (DELETE FROM {source} WHERE {condition} RETURNING t.*),
+                     archived AS (INSERT INTO {table}_archive SELECT * FROM removed)
+                SELECT count(*), COALESCE(sum(pg_column_size(removed.*)), 0) FROM removed
+            """
+        else:
+            statement = f"""
+                WITH removed AS (DELETE FROM {source} WHERE {condition} RETURNING pg_column_size(t.*) AS size)
+                SELECT count(*), COALESCE(sum(size), 0) FROM removed
+            """
+
+        rows, size = conn.execute(text(statement), params).one()
+        return {"rows": int(rows), "bytes": int(size)}
+
+    def run(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Compact every thread (or the first ``limit``) and return rows/bytes reclaimed per table."""
+        report: Dict[str, Any] = {
+            "threads": 0,
+            "dry_run": self.dry_run,
+            "archived": self.archive and not self.dry_run,
+            **{table: {"rows": 0, "bytes": 0} for table in CHECKPOINT_TABLES},
+        }
+
+        with engine.connect() as conn:
+            thread_ids = self.list_threads(conn)
+        if limit:
+            thread_ids = thread_ids[:limit]
+
+        if self.archive and not self.dry_run:
+            with engine.begin() as conn:
+                self._ensure_archive_tables(conn)
+
+        for start in range(0, len(thread_ids), self.batch_size):
+            batch = thread_ids[start:start + self.batch_size]
+            with engine.begin() as conn:
+                # Writes before their checkpoints; blobs last, once only kept checkpoints remain
+                for table in ("checkpoint_writes", "checkpoints", "checkpoint_blobs"):
+                    result = self._compact_table(conn, table, batch)
+                    report[table]["rows"] += result["rows"]
+                    report[table]["bytes"] += result["bytes"]
+            report["threads"] += len(batch)
+            print(f"\rCompacted {report['threads']}/{len(thread_ids)} threads", end="", flush=True)
+
+        if thread_ids:
+            print()
+        report["total_rows"] = sum(report[table]["rows"] for table in CHECKPOINT_TABLES)
+        report["total_bytes"] = sum(report[table]["bytes"] for table in CHECKPOINT_TABLES)
+        return report
+
+    def vacuum(self) -> None:
+        """Hand the freed space back to Postgres (VACUUM cannot run inside a transaction)."""
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in CHECKPOINT_TABLES:
+                conn.execute(text(f"VACUUM (ANALYZE) {table}"))
@@ -0,0 +1,237 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+class _ThreadEntry:
+    def __init__(self, saver: InMemorySaver):
+        self.saver = saver
+        self.last_access = time.monotonic()
+        self.bytes = 0
+
+
+class BoundedConversationStore(BaseCheckpointSaver):
+    """In-memory LangGraph checkpointer with bounded size.
+
+    Every thread gets its own InMemorySaver so evicting a conversation is O(1).
+    Threads are evicted least-recently-used first when there are more than
+    ``max_threads`` or the serialized state exceeds ``max_bytes``, and whenever
+    they have been idle for longer than ``ttl_seconds``. Only the newest
+    ``max_checkpoints_per_thread`` checkpoints of a thread are kept, so a long
+    conversation does not accumulate one copy of its history per turn.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 1000,
+        ttl_seconds: float = 3600.0,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_checkpoints_per_thread: int = 2,
+    ):
+        super().__init__()
+        self.max_threads = max_threads
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.max_checkpoints_per_thread = max(1, max_checkpoints_per_thread)
+        self._threads: "OrderedDict[str, _ThreadEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._evictions = {"lru": 0, "ttl": 0, "memory": 0}
+        self._versioner = InMemorySaver(serde=self.serde)
+
+    # Thread bookkeeping
+
+    def _entry(self, thread_id: str, create: bool) -> Optional[_ThreadEntry]:
+        self._expire()
+        entry = self._threads.get(thread_id)
+        if entry is None and create:
+            entry = _ThreadEntry(InMemorySaver(serde=self.serde))
+            self._threads[thread_id] = entry
+        if entry is not None:
+            entry.last_access = time.monotonic()
+            self._threads.move_to_end(thread_id)
+        return entry
+
+    def _drop(self, thread_id: str, reason: Optional[str] = None) -> None:
+        entry = self._threads.pop(thread_id, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry.bytes
+        if reason:
+            self._evictions[reason] += 1
+
+    def _expire(self) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._threads:
+            thread_id, entry = next(iter(self._threads.items()))
+            if entry.last_access >= cutoff:
+                break
+            self._drop(thread_id, "ttl")
+
+    def _enforce_limits(self, current_thread: str) -> None:
+        while len(self._threads) > self.max_threads:
+            self._drop(next(iter(self._threads)), "lru")
+        # Never evict the conversation being written, even if it alone exceeds the ceiling
+        while self._total_bytes > self.max_bytes and len(self._threads) > 1:
+            oldest = next(iter(self._threads))
+            if oldest == current_thread:
+                break
+            self._drop(oldest, "memory")
+
+    def _prune(self, entry: _ThreadEntry) -> None:
+        """Keep only the newest checkpoints (and the channel values they can reference)."""
+        saver = entry.saver
+        keep = self.max_checkpoints_per_thread
+        for thread_id, namespaces in saver.storage.items():
+            for checkpoint_ns, checkpoints in namespaces.items():
+                for checkpoint_id in sorted(checkpoints)[:-keep]:
+                    del checkpoints[checkpoint_id]
+                    saver.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+        # Blob versions sort in write order; keep the newest few per channel
+        versions: Dict[tuple, list] = {}
+        for key in saver.blobs:
+            versions.setdefault(key[:3], []).append(key[3])
+        for channel_key, channel_versions in versions.items():
+            for version in sorted(channel_versions)[:-keep]:
+                del saver.blobs[channel_key + (version,)]
+
+    def _measure(self, entry: _ThreadEntry) -> None:
+        saver = entry.saver
+        size = sum(len(blob[1]) for blob in saver.blobs.values())
+        for namespaces in saver.storage.values():
+            for checkpoints in namespaces.values():
+                size += sum(len(checkpoint[1]) + len(metadata[1]) for checkpoint, metadata, _ in checkpoints.values())
+        for writes in saver.writes.values():
+            size += sum(len(write[2][1]) for write in writes.values())
+        self._total_bytes += size - entry.bytes
+        entry.bytes = size
+
+    def _after_write(self, thread_id: str, entry: _ThreadEntry) -> None:
+        self._prune(entry)
+        self._measure(entry)
+        self._enforce_limits(thread_id)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire()
+            return {
+                "live_threads": len(self._threads),
+                "bytes_held": self._total_bytes,
+                "max_threads": self.max_threads,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": dict(self._evictions),
+            }
+
+    # BaseCheckpointSaver interface
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self._lock:
+            entry = self._entry(config["configurable"]["thread_id"], create=False)
+            return entry.saver.get_tuple(config) if entry else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        with self._lock:
+            if config:
+                entry = self._entry(config["configurable"]["thread_id"], create=False)
+                savers = [entry.saver] if entry else []
+            else:
+                self._expire()
+                savers = [entry.saver for entry in self._threads.values()]
+            items = []
+            for saver in savers:
+                items.extend(saver.list(config, filter=filter, before=before))
+        if limit is not None:
+            items = items[:limit]
+        yield from items
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            entry = self._entry(thread_id, create=True)
+            result = entry.saver.put(config, checkpoint, metadata, new_versions)
+            self._after_write(thread_id, entry)
+            return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        with self._lock:
+            entry = self._entry(thread_id, create=True)
+            entry.saver.put_writes(config, writes, task_id, task_path)
+            self._measure(entry)
+            self._enforce_limits(thread_id)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._drop(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        return self._versioner.get_next_version(current, channel)
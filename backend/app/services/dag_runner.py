@@ -0,0 +1,113 @@
+import asyncio
+import inspect
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+StageResult = Dict[str, Any]
+StageFunc = Callable[[Dict[str, Any]], Union[StageResult, Awaitable[StageResult]]]
+
+
+class Stage:
+    """A named pipeline step with its upstream dependencies."""
+
+    def __init__(
+        self,
+        name: str,
+        func: StageFunc,
+        depends_on: Iterable[str] = (),
+        when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.when = when
+
+
+class DagRunner:
+    """Minimal dependency-graph runner for async pipelines.
+
+    Every stage starts as soon as all of its dependencies have finished, so
+    independent stages (e.g. two LLM calls) run concurrently. Stages receive the
+    shared state and return a partial update which is merged when they finish:
+    ``logs`` entries are appended, every other key is overwritten. A stage that
+    sets ``error`` (or any ``stop_keys`` entry) cancels whatever is still running.
+    Per-stage wall-clock timings are appended to ``state["logs"]``.
+    """
+
+    def __init__(self, stop_keys: Iterable[str] = ("error",)):
+        self.stages: Dict[str, Stage] = {}
+        self.stop_keys = tuple(stop_keys)
+
+    def add_stage(
+        self,
+        name: str,
+        func: StageFunc,
+        depends_on: Iterable[str] = (),
+        when: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> "DagRunner":
+        for dep in depends_on:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self.stages[name] = Stage(name, func, depends_on, when)
+        return self
+
+    async def _run_stage(self, stage: Stage, state: Dict[str, Any]) -> StageResult:
+        result = stage.func(state)
+        if inspect.isawaitable(result):
+            result = await result
+        return result or {}
+
+    def _merge(self, state: Dict[str, Any], update: StageResult) -> None:
+        for key, value in update.items():
+            if key == "logs":
+                state.setdefault("logs", []).extend(value)
+            else:
+                state[key] = value
+
+    def _should_stop(self, state: Dict[str, Any]) -> bool:
+        return any(state.get(key) for key in self.stop_keys)
+
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        logs: List[str] = state.setdefault("logs", [])
+        finished: set = set()
+        running: Dict[asyncio.Task, tuple] = {}
+        pipeline_started = time.perf_counter()
+
+        while len(finished) < len(self.stages):
+            for stage in self.stages.values():
+                if stage.name in finished or any(t[0] is stage for t in running.values()):
+                    continue
+                if not all(dep in finished for dep in stage.depends_on):
+                    continue
+                if stage.when is not None and not stage.when(state):
+                    finished.add(stage.name)
+                    logs.append(f"[timing] {stage.name}: skipped")
+                    continue
+                task = asyncio.create_task(self._run_stage(stage, state))
+                running[task] = (stage, time.perf_counter())
+
+            if not running:
+                if len(finished) < len(self.stages):
+                    raise RuntimeError("Pipeline has unsatisfiable stage dependencies")
+                break
+
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage, started = running.pop(task)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                try:
+                    update = task.result()
+                except Exception as e:
+                    update = {"error": f"Stage '{stage.name}' failed: {str(e)}"}
+                self._merge(state, update)
+                finished.add(stage.name)
+                logs.append(f"[timing] {stage.name}: {elapsed_ms:.0f} ms")
+
+            if self._should_stop(state):
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+                break
+
+        logs.append(f"[timing] pipeline total: {(time.perf_counter() - pipeline_started) * 1000:.0f} ms")
+        return state
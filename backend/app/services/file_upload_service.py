@@ -1,15 +1,31 @@
 from fastapi import UploadFile
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from app.services.base_service import BaseService
 from app.constents import UPLOAD_BASE_DIR
+from app.core.config import settings
+import asyncio
+import hashlib
 import os
+import tempfile
 from datetime import datetime
+from pathlib import Path
 
 from app.schemas.common import FileUploadResponse
 
+
+class FileTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_UPLOAD_BYTES."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"File too large. Maximum upload size is {limit / (1024 * 1024):g} MB.")
+
+
 class FileUploadService(BaseService):
-    def __init__(self):
+    def __init__(self, max_bytes: int = None, chunk_size: int = None):
         super().__init__()
+        self.max_bytes = max_bytes or settings.MAX_UPLOAD_BYTES
+        self.chunk_size = chunk_size or settings.UPLOAD_CHUNK_BYTES
 
     async def process(self, file: UploadFile) -> Dict[str, Any]:
         if not await self.validate(file):
@@ -19,19 +35,23 @@ class FileUploadService(BaseService):
                 success=False,
             )
 
-        # Save to relative path (works from any OS/directory)
-        contents = await file.read()
-        upload_path = UPLOAD_BASE_DIR / file.filename
+        # By now Starlette has spooled the whole part; RequestSizeLimitMiddleware is what
+        # stops oversized requests before parsing. This catches an oversized zip member
+        # or bulk file without copying it again.
+        if file.size is not None and file.size > self.max_bytes:
+            raise FileTooLargeError(self.max_bytes)
+
         os.makedirs(UPLOAD_BASE_DIR, exist_ok=True)
-        with open(upload_path, "wb") as f:
-            f.write(contents)
+        size, sha256, upload_path, duplicate = await self.save_stream(file)
 
         # Return relative path (works everywhere)
         data = FileUploadResponse(
-            name=file.filename, 
-            path=str(upload_path),  
-            size=file.size, 
-            created_at=datetime.now()
+            name=file.filename,
+            path=str(upload_path),
+            size=size,
+            created_at=datetime.now(),
+            sha256=sha256,
+            duplicate=duplicate,
         )
 
         return self.format_response(
@@ -39,10 +59,48 @@ class FileUploadService(BaseService):
             data=data,
             success=True,
         )
-    
-    async def validate(self, file: UploadFile) -> bool:
-        return bool(file and file.filename and file.content_type == "application/pdf")
 
- 
+    @staticmethod
+    def blob_path(sha256: str) -> Path:
+        """Content-addressed location of an upload: identical files share one blob."""
+        return UPLOAD_BASE_DIR / f"{sha256}.pdf"
+
+    async def save_stream(self, file: UploadFile) -> Tuple[int, str, Path, bool]:
+        """
+        Copy an upload to disk chunk by chunk, hashing as it goes.
+
+        Blocking writes run in a worker thread so the event loop keeps serving
+        other requests. Data goes to a temp file in the upload directory and is
+        only renamed to its content-addressed path once complete, so an
+        oversized or aborted upload never leaves a partial file behind. If a
+        blob with the same hash already exists, the temp file is dropped.
 
+        Returns:
+            (bytes written, hex SHA-256, blob path, whether the blob already existed)
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_BASE_DIR, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := await file.read(self.chunk_size):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise FileTooLargeError(self.max_bytes)
+                    digest.update(chunk)
+                    await asyncio.to_thread(out.write, chunk)
+            sha256 = digest.hexdigest()
+            destination = self.blob_path(sha256)
+            duplicate = destination.exists()
+            if duplicate:
+                os.remove(tmp_path)
+            else:
+                await asyncio.to_thread(os.replace, tmp_path, destination)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return size, sha256, destination, duplicate
 
+    async def validate(self, file: UploadFile) -> bool:
+        return bool(file and file.filename and file.content_type == "application/pdf")
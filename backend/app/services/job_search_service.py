@@ -157,6 +157,23 @@ class JobSearchService(BaseService):
         req = SearchRequest(query=query or resume_text[:500], limit=limit, min_score=min_score)
         return await self.process(req)
 
+    def list_job_ids(self, page_size: int = 1000) -> List[Any]:
+        """Return every distinct job_id in the collection, in storage order."""
+        db = self._get_vector_db()
+        seen: Dict[str, Any] = {}
+        offset = 0
+        while True:
+            page = db._collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            metadatas: List[Dict[str, Any]] = page.get("metadatas") or []
+            if not metadatas:
+                break
+            for md in metadatas:
+                job_id = (md or {}).get("job_id")
+                if job_id is not None and str(job_id) not in seen:
+                    seen[str(job_id)] = job_id
+            offset += len(metadatas)
+        return list(seen.values())
+
     async def get_job_detail(self, job_id: str | int) -> Dict[str, Any]:
         """Fetch full job details by job_id by aggregating all chunks for that job."""
         try:
@@ -0,0 +1,250 @@
+import asyncio
+import math
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.db.models import LearningPlanJob
+from app.schemas.learning_plan import LearningPlanRequest
+from app.services.learning_plan_service import LearningPlanService
+
+
+class QueueFullError(RuntimeError):
+    """Raised when too many learning plan jobs are already pending."""
+
+
+class LearningPlanJobQueue:
+    """Background worker pool generating learning plans outside the request cycle.
+
+    Jobs are persisted in learning_plan_jobs; the in-process queue only carries
+    plan IDs, so unfinished jobs are picked up again after a restart.
+
+    A claimed job holds a lease of LEARNING_PLAN_JOB_LEASE_SECONDS: generation is
+    cancelled past it, so a "running" job with an expired lease can only belong to
+    a process that died, and a periodic sweep hands it out again. Jobs interrupted
+    by stop() are put back in the queue straight away.
+    """
+
+    def __init__(self, workers: int = settings.LEARNING_PLAN_WORKERS, max_pending: int = settings.LEARNING_PLAN_MAX_PENDING):
+        self.service = LearningPlanService()
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        # Plan IDs this process is generating right now (never reclaimed by its own sweep)
+        self._running: Set[str] = set()
+        # Moving average of recent generation durations, used for completion estimates
+        self._avg_duration = 60.0
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._requeue_unfinished()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep_leases()))
+        print(f"✅ Learning plan workers started ({self.workers})")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        print("🛑 Learning plan workers stopped")
+
+    def _reclaim_expired(self, db: Session) -> List[str]:
+        """Move "running" jobs whose lease has expired back to queued; returns their plan IDs.
+
+        A live worker never holds a job past its lease (see _run_job), so these were
+        left behind by a process that crashed or was killed.
+        """
+        lease_expired = func.now() - timedelta(seconds=settings.LEARNING_PLAN_JOB_LEASE_SECONDS)
+        stmt = update(LearningPlanJob).where(
+            LearningPlanJob.status == "running", LearningPlanJob.started_at < lease_expired
+        )
+        if self._running:
+            stmt = stmt.where(LearningPlanJob.plan_id.notin_(self._running))
+        reclaimed = db.execute(
+            stmt.values(status="queued", started_at=None).returning(LearningPlanJob.plan_id)
+        ).scalars().all()
+        db.commit()
+        return list(reclaimed)
+
+    def _requeue_unfinished(self) -> None:
+        """Queue jobs left over from a previous run.
+
+        Jobs are claimed atomically in _run_job, so queuing the same plan ID in
+        several processes is safe.
+        """
+        db = SessionLocal()
+        try:
+            self._reclaim_expired(db)
+            plan_ids = db.query(LearningPlanJob.plan_id).filter(
+                LearningPlanJob.status == "queued"
+            ).order_by(LearningPlanJob.created_at).all()
+            for (plan_id,) in plan_ids:
+                self.queue.put_nowait(plan_id)
+        finally:
+            db.close()
+
+    async def _sweep_leases(self) -> None:
+        """Periodically requeue jobs whose worker process died mid-generation."""
+        while True:
+            await asyncio.sleep(settings.LEARNING_PLAN_LEASE_SWEEP_SECONDS)
+            db = SessionLocal()
+            try:
+                for plan_id in self._reclaim_expired(db):
+                    print(f"⚠️ Learning plan job {plan_id} lease expired, requeued")
+                    self.queue.put_nowait(plan_id)
+            except Exception as e:
+                print(f"Learning plan lease sweep failed: {e}")
+            finally:
+                db.close()
+
+    def _release(self, plan_id: str, status: str, error: Optional[str] = None) -> None:
+        """Take a claimed job out of "running" when its worker stops before finishing it.
+
+        Errors are only logged: if this fails too, the lease sweep reclaims the job later.
+        """
+        values = {"status": status, "error": error}
+        if status == "queued":
+            values["started_at"] = None
+        else:
+            values["completed_at"] = func.now()
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(LearningPlanJob)
+                .where(LearningPlanJob.plan_id == plan_id, LearningPlanJob.status == "running")
+                .values(**values)
+            )
+            db.commit()
+        except Exception as e:
+            print(f"Failed to release learning plan job {plan_id}: {e}")
+        finally:
+            db.close()
+
+    def _claim(self, db: Session, plan_id: str) -> bool:
+        """Atomically move a queued job to running; False if another worker already has it."""
+        claimed = db.execute(
+            update(LearningPlanJob)
+            .where(LearningPlanJob.plan_id == plan_id, LearningPlanJob.status == "queued")
+            .values(status="running", started_at=func.now())
+            .returning(LearningPlanJob.plan_id)
+        ).first()
+        db.commit()
+        return claimed is not None
+
+    def submit(self, db: Session, user_id: int, request: LearningPlanRequest) -> LearningPlanJob:
+        """Persist a new job and hand it to the worker pool."""
+        if self.queue.qsize() >= self.max_pending:
+            raise QueueFullError("Too many learning plans are being generated, please retry shortly")
+
+        job = LearningPlanJob(
+            plan_id=str(uuid.uuid4()),
+            user_id=user_id,
+            resume_id=request.resume_id,
+            status="queued",
+            request=request.model_dump(),
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self.queue.put_nowait(job.plan_id)
+        return job
+
+    def estimate_completion(self) -> datetime:
+        """Rough ETA for a job submitted now, based on queue depth and recent durations."""
+        rounds = math.ceil((self.queue.qsize() + 1) / max(1, self.workers))
+        return datetime.now() + timedelta(seconds=rounds * self._avg_duration)
+
+    async def _worker(self) -> None:
+        while True:
+            plan_id = await self.queue.get()
+            try:
+                await self._run_job(plan_id)
+            except Exception as e:
+                print(f"Learning plan job {plan_id} crashed: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _run_job(self, plan_id: str) -> None:
+        db = SessionLocal()
+        try:
+            claimed = self._claim(db, plan_id)
+        except BaseException:
+            db.close()
+            raise
+        if not claimed:
+            db.close()
+            return
+
+        self._running.add(plan_id)
+        try:
+            job = db.query(LearningPlanJob).filter(LearningPlanJob.plan_id == plan_id).first()
+
+            request = LearningPlanRequest(**job.request)
+            started = time.monotonic()
+            try:
+                # Bounded by the lease, so the sweep never hands out a job that is still being generated
+                result = await asyncio.wait_for(
+                    self.service.generate_plan(
+                        db=db,
+                        resume_id=request.resume_id,
+                        timeline_months=request.timeline_months,
+                        experience_level=request.experience_level,
+                        job_analysis_id=request.job_analysis_id,
+                        rag_enabled=request.rag_enabled,
+                        plan_id=plan_id,
+                        regenerate=request.regenerate,
+                    ),
+                    timeout=settings.LEARNING_PLAN_JOB_LEASE_SECONDS,
+                )
+            except asyncio.TimeoutError:
+                result = {
+                    "success": False,
+                    "message": f"Learning plan generation timed out after {settings.LEARNING_PLAN_JOB_LEASE_SECONDS:g}s",
+                }
+            except Exception as e:
+                result = {"success": False, "message": f"Failed to generate learning plan: {str(e)}"}
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * (time.monotonic() - started)
+
+            db.rollback()  # discard anything the pipeline left pending before updating the job
+            job = db.query(LearningPlanJob).filter(LearningPlanJob.plan_id == plan_id).first()
+            if result.get("success"):
+                job.status = "completed"
+                job.result = jsonable_encoder(result["data"])
+            else:
+                job.status = "failed"
+                job.error = result.get("message", "Failed to generate plan")
+            job.completed_at = func.now()
+            db.commit()
+        except asyncio.CancelledError:
+            # stop() during generation: hand the job back so the next start picks it up
+            db.rollback()
+            self._release(plan_id, "queued")
+            raise
+        except BaseException as e:
+            # Never leave a claimed job "running": pollers would wait on it forever
+            db.rollback()
+            self._release(plan_id, "failed", f"Learning plan job crashed: {str(e)}")
+            raise
+        finally:
+            self._running.discard(plan_id)
+            db.close()
+
+    def get_job(self, db: Session, plan_id: str, user_id: int) -> Optional[LearningPlanJob]:
+        return db.query(LearningPlanJob).filter(
+            LearningPlanJob.plan_id == plan_id,
+            LearningPlanJob.user_id == user_id,
+        ).first()
+
+
+learning_plan_queue = LearningPlanJobQueue()
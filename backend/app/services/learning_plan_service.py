@@ -1,16 +1,26 @@
 from typing import Dict, List, Any, Optional, TypedDict
+import hashlib
+import json
 import uuid
 from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
+from fastapi.encoders import jsonable_encoder
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from langgraph.graph import StateGraph, END
 
-from app.db.models import ResumeCritique, JobFitAnalysis, JobFitAnalysisJob, ResumeDetails
-from app.external.llm_clients.openai_client import llm
+from app.db.models import ResumeCritique, JobFitAnalysis, JobFitAnalysisJob, ResumeDetails, LearningPlan
+from app.external import llm, llm_gateway
+from app.services.dag_runner import DagRunner
 from app.services.job_search_service import JobSearchService
+from app.services.skill_extraction_service import SkillExtractionService
+from app.services.skill_lexicon import get_skill_lexicon
 from app.schemas.learning_plan import LearningPlanResponse, LearningModule, PriorityAnalysis, ScoreImprovements
 
+# Bump whenever the plan prompts or pipeline change; stored plans from other versions are regenerated
+PLAN_PROMPT_VERSION = "learning-plan-v1"
+
 
 class PlanState(TypedDict, total=False):
     """State for learning plan generation pipeline"""
@@ -22,6 +32,7 @@ class PlanState(TypedDict, total=False):
     rag_enabled: bool
 
     # Retrieved data
+    critique_id: int
     resume_critique: Dict[str, Any]
     job_matches: List[Dict[str, Any]]
     selected_job: Dict[str, Any]
@@ -50,6 +61,7 @@ class LearningPlanService:
 
     def __init__(self):
         self.job_search_service = JobSearchService()
+        self.skill_service = SkillExtractionService()
 
     async def generate_plan(
         self,
@@ -58,15 +70,24 @@ class LearningPlanService:
         timeline_months: int = 3,
         experience_level: str = "intermediate",
         job_analysis_id: Optional[int] = None,
-        rag_enabled: bool = False
+        rag_enabled: bool = False,
+        plan_id: Optional[str] = None,
+        regenerate: bool = False
     ) -> Dict[str, Any]:
-        """Generate learning plan using LLM-powered orchestration"""
+        """Generate learning plan using LLM-powered orchestration.
+
+        The critique and selected job are loaded once, up front; plans are memoized
+        by a hash of exactly that content plus the parameters and prompt version,
+        and the pipeline runs on the same loaded inputs. A stored plan is returned
+        as-is unless ``regenerate`` is set. The result always carries the caller's
+        ``plan_id``; a stored plan's own ID is reported as ``source_plan_id``.
+        """
 
-        # Generate unique plan ID
-        plan_id = str(uuid.uuid4())
+        # Generate unique plan ID (queued jobs pass the ID they were created with)
+        plan_id = plan_id or str(uuid.uuid4())
 
         # Initialize state
-        initial_state: PlanState = {
+        state: PlanState = {
             "resume_id": resume_id,
             "job_analysis_id": job_analysis_id,
             "timeline_months": timeline_months,
@@ -76,9 +97,30 @@ class LearningPlanService:
             "logs": [f"Starting learning plan generation for resume {resume_id}"]
         }
 
+        # Resolve the inputs once: the cache key describes them and the pipeline consumes them
+        for load in (self._load_resume_data, self._load_job_data):
+            loaded = await load(db, state)
+            if loaded.get("error"):
+                return {"success": False, "message": loaded["error"], "plan_id": plan_id}
+            state.update({key: value for key, value in loaded.items() if key != "logs"})
+            state["logs"].extend(loaded.get("logs", []))
+
+        cache_key = self.plan_cache_key(state)
+        if not regenerate:
+            stored = self.get_stored_plan(db, cache_key)
+            if stored:
+                return {
+                    "success": True,
+                    "message": "Learning plan loaded from store",
+                    "data": stored.plan,
+                    "plan_id": plan_id,
+                    "source_plan_id": stored.plan_id,
+                    "cached": True
+                }
+
         try:
             # Execute the orchestrated pipeline
-            final_state = await self._run_pipeline(db, initial_state)
+            final_state = await self._run_pipeline(db, state)
 
             if final_state.get("error"):
                 return {
@@ -90,11 +132,14 @@ class LearningPlanService:
             # Convert to response format
             response = self._build_response(final_state)
 
+            self.save_plan(db, cache_key, plan_id, final_state["critique_id"], final_state["job_analysis_id"], final_state, response)
+
             return {
                 "success": True,
                 "message": "Learning plan generated successfully",
                 "data": response.model_dump(),
-                "plan_id": plan_id
+                "plan_id": plan_id,
+                "cached": False
             }
 
         except Exception as e:
@@ -104,48 +149,95 @@ class LearningPlanService:
                 "plan_id": plan_id
             }
 
-    async def _run_pipeline(self, db: Session, state: PlanState) -> PlanState:
-        """Run the complete orchestrated pipeline"""
-
-        # 1. Load resume critique data
-        state = await self._load_resume_data(db, state)
-        if state.get("error"):
-            return state
-
-        # 2. Load and select best job
-        state = await self._load_job_data(db, state)
-        if state.get("error"):
-            return state
-
-        # 3. Extract skills from job description using LLM
-        state = await self._extract_job_skills_llm(state)
-        if state.get("error"):
-            return state
-
-        # 4. Ground resume capabilities (deterministic)
-        state = self._ground_resume_capabilities(state)
-
-        # 5. Compute gaps and priorities (deterministic)
-        state = self._compute_gaps_and_priorities(state)
-
-        # 6. Synthesize learning modules (LLM-powered)
-        state = await self._synthesize_modules(state)
-        if state.get("error"):
-            return state
-
-        # 7. Attach resources if RAG enabled
-        if state.get("rag_enabled"):
-            state = await self._attach_resources(state)
+    def plan_cache_key(self, state: PlanState) -> str:
+        """Hash of everything a generated plan depends on, used as the learning_plans key.
+
+        Built from the loaded critique and selected job themselves (not their IDs),
+        so a key always describes the inputs the pipeline actually planned from.
+        """
+        payload = json.dumps({
+            "prompt_version": PLAN_PROMPT_VERSION,
+            "model_name": getattr(llm, "model_name", "") or "",
+            "critique": state["resume_critique"],
+            "selected_job": state["selected_job"],
+            "timeline_months": state["timeline_months"],
+            "experience_level": state["experience_level"].strip().lower(),
+            "rag_enabled": bool(state.get("rag_enabled")),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_stored_plan(self, db: Session, cache_key: str) -> Optional[LearningPlan]:
+        return db.query(LearningPlan).filter(
+            LearningPlan.cache_key == cache_key,
+            LearningPlan.prompt_version == PLAN_PROMPT_VERSION
+        ).first()
+
+    def save_plan(
+        self,
+        db: Session,
+        cache_key: str,
+        plan_id: str,
+        critique_id: int,
+        analysis_id: int,
+        state: PlanState,
+        response: LearningPlanResponse
+    ) -> None:
+        """Upsert a generated plan; a failure here never fails the generation itself."""
+        try:
+            stmt = insert(LearningPlan).values(
+                cache_key=cache_key,
+                plan_id=plan_id,
+                resume_id=state["resume_id"],
+                critique_id=critique_id,
+                analysis_id=analysis_id,
+                timeline_months=state["timeline_months"],
+                experience_level=state["experience_level"],
+                rag_enabled=bool(state.get("rag_enabled")),
+                prompt_version=PLAN_PROMPT_VERSION,
+                plan=jsonable_encoder(response),
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["cache_key"],
+                set_={
+                    "plan_id": stmt.excluded.plan_id,
+                    "prompt_version": stmt.excluded.prompt_version,
+                    "plan": stmt.excluded.plan,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            db.execute(stmt)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to store learning plan {plan_id}: {e}")
 
-        # 8. Package final response
-        state = self._package_response(state)
+    async def _run_pipeline(self, db: Session, state: PlanState) -> PlanState:
+        """Run the orchestrated pipeline as a dependency graph.
+
+        The critique and selected job are already in ``state`` (see generate_plan).
+
+        ground_resume ──────┐
+        extract_job_skills ─┴─► compute_gaps ─┬─► synthesize_basic ─► attach_resources ─┐
+                                              └─► synthesize_advanced ─────────────────┴─► package
+        """
+        runner = DagRunner()
+        runner.add_stage("extract_job_skills", lambda s: self._extract_job_skills_llm(db, s))
+        runner.add_stage("ground_resume", self._ground_resume_capabilities)
+        runner.add_stage("compute_gaps", self._compute_gaps_and_priorities, depends_on=["extract_job_skills", "ground_resume"])
+        runner.add_stage("synthesize_basic", self._synthesize_basic_plan, depends_on=["compute_gaps"])
+        runner.add_stage("synthesize_advanced", self._synthesize_advanced_plan, depends_on=["compute_gaps"])
+        runner.add_stage(
+            "attach_resources",
+            self._attach_resources,
+            depends_on=["synthesize_basic"],
+            when=lambda s: bool(s.get("rag_enabled")),
+        )
+        runner.add_stage("package", self._package_response, depends_on=["attach_resources", "synthesize_advanced"])
 
-        return state
+        return await runner.run(state)
 
     async def _load_resume_data(self, db: Session, state: PlanState) -> PlanState:
         """Load resume critique data from database"""
-        logs = state.get("logs", [])
-
         try:
             # Get resume critique
             critique = db.query(ResumeCritique).filter(
@@ -153,20 +245,15 @@ class LearningPlanService:
             ).order_by(ResumeCritique.created_at.desc()).first()
 
             if not critique:
-                return {**state, "error": "No resume critique found", "logs": logs + ["No resume critique found"]}
-
-            state["resume_critique"] = critique.review
-            logs.append("Loaded resume critique data")
+                return {"error": "No resume critique found", "logs": ["No resume critique found"]}
 
         except Exception as e:
-            return {**state, "error": f"Failed to load resume data: {str(e)}", "logs": logs + [f"Resume data load error: {str(e)}"]}
+            return {"error": f"Failed to load resume data: {str(e)}", "logs": [f"Resume data load error: {str(e)}"]}
 
-        return {**state, "logs": logs}
+        return {"critique_id": critique.id, "resume_critique": critique.review, "logs": ["Loaded resume critique data"]}
 
     async def _load_job_data(self, db: Session, state: PlanState) -> PlanState:
         """Load job analysis data and select best job"""
-        logs = state.get("logs", [])
-
         try:
             analysis_id = state.get("job_analysis_id")
 
@@ -182,7 +269,7 @@ class LearningPlanService:
                 ).order_by(JobFitAnalysis.created_at.desc()).first()
 
             if not analysis:
-                return {**state, "error": "No job analysis found", "logs": logs + ["No job analysis found"]}
+                return {"error": "No job analysis found", "logs": ["No job analysis found"]}
 
             # Get job matches
             job_matches = db.query(JobFitAnalysisJob).filter(
@@ -190,27 +277,29 @@ class LearningPlanService:
             ).order_by(JobFitAnalysisJob.similarity_score.desc()).all()
 
             if not job_matches:
-                return {**state, "error": "No job matches found", "logs": logs + ["No job matches found"]}
+                return {"error": "No job matches found", "logs": ["No job matches found"]}
 
             # Select best job (highest similarity score)
             best_job_db = job_matches[0]
-            state["job_matches"] = [self._convert_job_match(j) for j in job_matches]
 
             # Get full job details
             job_detail_result = await self.job_search_service.get_job_detail(best_job_db.job_id)
             if not job_detail_result.get("success"):
-                return {**state, "error": "Failed to get job details", "logs": logs + ["Failed to get job details"]}
+                return {"error": "Failed to get job details", "logs": ["Failed to get job details"]}
 
             selected_job = job_detail_result["data"]
             selected_job["similarity_score"] = best_job_db.similarity_score
-            state["selected_job"] = selected_job
-
-            logs.append(f"Selected best job: {selected_job.get('title')} at {selected_job.get('company')}")
 
         except Exception as e:
-            return {**state, "error": f"Failed to load job data: {str(e)}", "logs": logs + [f"Job data load error: {str(e)}"]}
+            return {"error": f"Failed to load job data: {str(e)}", "logs": [f"Job data load error: {str(e)}"]}
 
-        return {**state, "logs": logs}
+        return {
+            # Pinned, so the stored plan records the analysis it was actually built from
+            "job_analysis_id": analysis.id,
+            "job_matches": [self._convert_job_match(j) for j in job_matches],
+            "selected_job": selected_job,
+            "logs": [f"Selected best job: {selected_job.get('title')} at {selected_job.get('company')}"],
+        }
 
     def _convert_job_match(self, job_db: JobFitAnalysisJob) -> Dict[str, Any]:
         """Convert database job match to dict"""
@@ -223,91 +312,68 @@ class LearningPlanService:
             "metadata": metadata
         }
 
-    async def _extract_job_skills_llm(self, state: PlanState) -> PlanState:
-        """Extract skills from job description using LLM only"""
-        logs = state.get("logs", [])
-
+    async def _extract_job_skills_llm(self, db: Session, state: PlanState) -> PlanState:
+        """Extract skills from job description with the skill lexicon, optionally enriched by the LLM"""
         try:
             job = state["selected_job"]
             job_description = job.get("full_description", "")
 
-            # LLM-powered skill extraction
-            prompt = PromptTemplate.from_template("""
-            Extract technical and professional skills required for this job. Be comprehensive and specific.
-
-            Job Description: {job_description}
-
-            Return only JSON with a "skills" array containing specific technologies, frameworks, tools, and skills.
-            Include both technical and soft skills. Focus on requirements explicitly mentioned or strongly implied.
-            Be precise - don't add generic skills unless clearly required.
-
-            Examples of what to extract:
-            - Programming languages (Python, JavaScript, TypeScript)
-            - Frameworks (React, Next.js, NestJS, Django)
-            - Tools (Docker, Kubernetes, Git, AWS)
-            - Methodologies (Agile, TDD, CI/CD)
-            - Soft skills (Communication, Leadership, Problem-solving)
-
-            Response format: {{"skills": ["skill1", "skill2", "skill3", ...]}}
-            """)
-
-            chain = prompt | llm | JsonOutputParser()
-            result = await chain.ainvoke({"job_description": job_description})
-
-            extracted_skills = result.get("skills", [])
+            extracted_skills, source = await self.skill_service.extract_job_skills(
+                db, job.get("job_id", ""), job_description
+            )
 
             # Validate extraction
             if not extracted_skills or len(extracted_skills) < 3:
-                return {**state, "error": "Insufficient skills extracted from job description", "logs": logs + ["LLM skill extraction failed - too few skills"]}
-
-            state["extracted_skills"] = extracted_skills
-            logs.append(f"LLM extracted {len(extracted_skills)} skills: {', '.join(extracted_skills[:5])}...")
+                return {"error": "Insufficient skills extracted from job description", "logs": ["Skill extraction failed - too few skills"]}
 
         except Exception as e:
-            return {**state, "error": f"Failed to extract skills from job description: {str(e)}", "logs": logs + [f"LLM skill extraction error: {str(e)}"]}
+            return {"error": f"Failed to extract skills from job description: {str(e)}", "logs": [f"Skill extraction error: {str(e)}"]}
 
-        return {**state, "logs": logs}
+        return {
+            "extracted_skills": extracted_skills,
+            "logs": [f"Extracted {len(extracted_skills)} skills ({source}): {', '.join(extracted_skills[:5])}..."],
+        }
 
     def _ground_resume_capabilities(self, state: PlanState) -> PlanState:
-        """Ground resume capabilities from critique data"""
-        logs = state.get("logs", [])
-
+        """Ground resume capabilities from critique data, normalized to canonical skill ids"""
+        lexicon = get_skill_lexicon()
         review = state["resume_critique"]
 
-        # Present skills from strong_points and skills fields
-        present_skills = review.get("strong_points", [])
-        if review.get("skills"):
-            present_skills.extend(review["skills"])
-
-        # Remove duplicates and normalize
-        present_skills = list(set(present_skills))
+        # Listed skills are normalized individually; free-text fields are scanned for skill mentions
+        present_ids = [lexicon.skill_id(skill) for skill in review.get("skills", []) if isinstance(skill, str) and skill.strip()]
+        for sentence in review.get("strong_points", []):
+            present_ids.extend(lexicon.scan(sentence))
 
         # Add inferred skills based on role_fit_analysis
-        role_fit = review.get("role_fit_analysis", "").lower()
+        role_fit = review.get("role_fit_analysis", "")
+        present_ids.extend(lexicon.scan(role_fit))
+        role_fit = role_fit.lower()
         if "frontend" in role_fit or "react" in role_fit:
-            present_skills.extend(["JavaScript", "HTML", "CSS"])
+            present_ids.extend(["javascript", "html", "css"])
         if "backend" in role_fit or "node" in role_fit or "api" in role_fit:
-            present_skills.extend(["JavaScript", "APIs"])
-
-        present_skills = list(set(present_skills))  # Remove duplicates again
+            present_ids.extend(["javascript", "rest_api"])
 
-        state["present_skills"] = present_skills
-        logs.append(f"Grounded {len(present_skills)} present skills from resume")
+        # Remove duplicates, keeping first-seen order
+        present_ids = list(dict.fromkeys(present_ids))
+        present_skills = [lexicon.name(skill_id) for skill_id in present_ids]
 
-        return {**state, "logs": logs}
+        return {
+            "present_skills": present_skills,
+            "logs": [f"Grounded {len(present_skills)} present skills from resume"],
+        }
 
     def _compute_gaps_and_priorities(self, state: PlanState) -> PlanState:
         """Compute skill gaps and prioritize based on job requirements"""
-        logs = state.get("logs", [])
+        lexicon = get_skill_lexicon()
 
-        required = set(state["extracted_skills"])
-        present = set(state["present_skills"])
+        # Compare canonical ids so "ReactJS" and "React" count as the same skill
+        required = {lexicon.skill_id(skill): lexicon.canonical_name(skill) for skill in state["extracted_skills"]}
+        present = {lexicon.skill_id(skill) for skill in state["present_skills"]}
 
-        gaps = list(required - present)
+        gaps = [name for skill_id, name in required.items() if skill_id not in present]
 
         # Prioritization logic
         review = state["resume_critique"]
-        timeline_months = state["timeline_months"]
 
         # Critical: skills explicitly mentioned and missing
         critical = gaps.copy()
@@ -315,14 +381,14 @@ class LearningPlanService:
         # Add supporting skills based on job type
         jd_text = state["selected_job"].get("full_description", "").lower()
         if "full" in jd_text and "stack" in jd_text:
-            supporting_skills = ["Testing", "CI/CD", "System Design"]
-            supporting = [s for s in supporting_skills if s in required and s not in present]
+            supporting_ids = ["testing", "ci_cd", "system_design"]
+            supporting = [lexicon.name(s) for s in supporting_ids if s in required and s not in present]
         else:
             supporting = []
 
         # Deferred: skills from resume missing list that aren't in job requirements
-        resume_missing = set(review.get("missing_skills", []))
-        deferred = list(resume_missing - required)
+        resume_missing = {lexicon.skill_id(skill): lexicon.canonical_name(skill) for skill in review.get("missing_skills", [])}
+        deferred = [name for skill_id, name in resume_missing.items() if skill_id not in required]
 
         priorities = {
             "critical": critical,
@@ -330,23 +396,17 @@ class LearningPlanService:
             "deferred": deferred
         }
 
-        state["gaps"] = gaps
-        state["priorities"] = priorities
-
-        logs.append(f"Computed {len(gaps)} skill gaps, prioritized into {len(critical)} critical, {len(supporting)} supporting, {len(deferred)} deferred")
-
-        return {**state, "logs": logs}
-
-    async def _synthesize_modules(self, state: PlanState) -> PlanState:
-        """Synthesize learning modules using LLM"""
-        logs = state.get("logs", [])
+        return {
+            "gaps": gaps,
+            "priorities": priorities,
+            "logs": [f"Computed {len(gaps)} skill gaps, prioritized into {len(critical)} critical, {len(supporting)} supporting, {len(deferred)} deferred"],
+        }
 
+    async def _synthesize_basic_plan(self, state: PlanState) -> PlanState:
+        """Synthesize the essential learning modules using LLM"""
         try:
             priorities = state["priorities"]
-            timeline_months = state["timeline_months"]
-            experience_level = state["experience_level"]
 
-            # Prepare prompt for basic plan
             basic_prompt = PromptTemplate.from_template("""
             Create a focused learning plan for job readiness. Generate 4-6 concise modules.
 
@@ -365,17 +425,25 @@ class LearningPlanService:
             Response format: {{"modules": [{{"title": "...", "duration": "...", "outcome": "...", "assessment": "..."}}]}}
             """)
 
-            # Generate basic plan
-            basic_chain = basic_prompt | llm | JsonOutputParser()
+            basic_chain = basic_prompt | llm_gateway.as_runnable() | JsonOutputParser()
             basic_result = await basic_chain.ainvoke({
                 "critical_skills": ", ".join(priorities["critical"]),
-                "timeline_months": timeline_months,
-                "experience_level": experience_level
+                "timeline_months": state["timeline_months"],
+                "experience_level": state["experience_level"]
             })
 
             basic_modules = basic_result.get("modules", [])
 
-            # Generate advanced plan (stretch goals)
+        except Exception as e:
+            return {"error": f"Failed to synthesize modules: {str(e)}", "logs": [f"Basic module synthesis error: {str(e)}"]}
+
+        return {"basic_plan": basic_modules, "logs": [f"Synthesized {len(basic_modules)} basic modules"]}
+
+    async def _synthesize_advanced_plan(self, state: PlanState) -> PlanState:
+        """Synthesize advanced (stretch) learning modules using LLM"""
+        try:
+            priorities = state["priorities"]
+
             advanced_prompt = PromptTemplate.from_template("""
             Create advanced learning modules for deeper expertise. Generate 2-4 modules.
 
@@ -389,25 +457,20 @@ class LearningPlanService:
             Response format: {{"modules": [{{"title": "...", "duration": "...", "outcome": "...", "assessment": "..."}}]}}
             """)
 
-            advanced_chain = advanced_prompt | llm | JsonOutputParser()
+            advanced_chain = advanced_prompt | llm_gateway.as_runnable() | JsonOutputParser()
             advanced_result = await advanced_chain.ainvoke({
                 "critical_skills": ", ".join(priorities["critical"]),
                 "supporting_skills": ", ".join(priorities["supporting"]),
-                "timeline_months": timeline_months,
-                "experience_level": experience_level
+                "timeline_months": state["timeline_months"],
+                "experience_level": state["experience_level"]
             })
 
             advanced_modules = advanced_result.get("modules", [])
 
-            state["basic_plan"] = basic_modules
-            state["advanced_plan"] = advanced_modules
-
-            logs.append(f"Synthesized {len(basic_modules)} basic and {len(advanced_modules)} advanced modules")
-
         except Exception as e:
-            return {**state, "error": f"Failed to synthesize modules: {str(e)}", "logs": logs + [f"Module synthesis error: {str(e)}"]}
+            return {"error": f"Failed to synthesize modules: {str(e)}", "logs": [f"Advanced module synthesis error: {str(e)}"]}
 
-        return {**state, "logs": logs}
+        return {"advanced_plan": advanced_modules, "logs": [f"Synthesized {len(advanced_modules)} advanced modules"]}
 
     async def _attach_resources(self, state: PlanState) -> PlanState:
         """Attach resources using RAG (simplified)"""
@@ -423,19 +486,18 @@ class LearningPlanService:
         }
 
         # Attach resources to basic plan modules
-        for module in state.get("basic_plan", []):
+        basic_plan = [dict(module) for module in state.get("basic_plan", [])]
+        for module in basic_plan:
             module_title = module.get("title", "")
             for skill, resources in curated_resources.items():
                 if skill in module_title:
                     module["resources"] = resources
                     break
 
-        return state
+        return {"basic_plan": basic_plan}
 
     def _package_response(self, state: PlanState) -> PlanState:
         """Package final response with estimates and analysis"""
-        logs = state.get("logs", [])
-
         # Calculate score improvements
         review = state["resume_critique"]
         current_skills = review.get("skills_score", 5)
@@ -462,13 +524,12 @@ class LearningPlanService:
             "rationale": f"Prioritized based on job requirements from {state['selected_job'].get('title')} at {state['selected_job'].get('company')}"
         }
 
-        state["score_improvements"] = score_improvements
-        state["estimated_duration"] = estimated_duration
-        state["priority_analysis"] = priority_analysis
-
-        logs.append("Packaged final learning plan response")
-
-        return {**state, "logs": logs}
+        return {
+            "score_improvements": score_improvements,
+            "estimated_duration": estimated_duration,
+            "priority_analysis": priority_analysis,
+            "logs": ["Packaged final learning plan response"],
+        }
 
     def _build_response(self, state: PlanState) -> LearningPlanResponse:
         """Build the final response object"""
@@ -1,31 +1,33 @@
-from langchain_core.messages import HumanMessage
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import START, MessagesState, StateGraph
+from typing import AsyncIterator
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from langgraph.graph import START, StateGraph
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from app.external import llm
-from langchain_core.messages import SystemMessage, trim_messages
+from app.external import llm, llm_gateway
+from app.core.config import settings
+from app.core.streaming import relay_in_background
+from app.services.chat_memory import SummarizedMessagesState, chat_memory
+from app.services.conversation_store import BoundedConversationStore
+from langchain_core.runnables import RunnableConfig
+
+# Process-wide /query history; bounded so a long-lived service cannot grow without limit
+query_conversation_store = BoundedConversationStore(
+    max_threads=settings.QUERY_MAX_THREADS,
+    ttl_seconds=settings.QUERY_THREAD_TTL_SECONDS,
+    max_bytes=settings.QUERY_STORE_MAX_BYTES,
+)
 
 class OPENAIService:
-    def __init__(self): 
+    def __init__(self, checkpointer: BoundedConversationStore = query_conversation_store): 
         self.llm = llm
-        self.trimmer = trim_messages(
-                        max_tokens=65,
-                        strategy="last",
-                        token_counter=self.llm,
-                        include_system=True,
-                        allow_partial=False,
-                        start_on="human",
-                    )
-        workflow = StateGraph(state_schema=MessagesState)
+        workflow = StateGraph(state_schema=SummarizedMessagesState)
         workflow.add_edge(START, "model")
         workflow.add_node("model", self.call_model)
-        memory = MemorySaver()
-        self.app = workflow.compile(checkpointer=memory)
+        self.app = workflow.compile(checkpointer=checkpointer)
 
-    async def call_model(self, state):
-        trimmed_messages = self.trimmer.invoke(state["messages"])
+    async def call_model(self, state, config: RunnableConfig):
+        context_messages = chat_memory.build_context(state)
         prompt = self.get_prompt_template()
-        resp = await self.llm.ainvoke(prompt.invoke(trimmed_messages))
+        resp = await llm_gateway.ainvoke(prompt.invoke(context_messages), config=config)
         return {"messages": [resp]}
 
     def get_config(self, id):
@@ -44,9 +46,22 @@ class OPENAIService:
     async def generate_response(self, query, id):
         config = self.get_config(id)
         response = await self.app.ainvoke({"messages": [HumanMessage(content=query)]}, config=config)    
+        chat_memory.schedule_summary(self.app, config, as_node="model", store="query")
         return response["messages"][-1].content
-    
 
+    async def stream_response(self, query, id) -> AsyncIterator[str]:
+        config = self.get_config(id)
 
+        async def run_graph() -> AsyncIterator[str]:
+            async for chunk, metadata in self.app.astream(
+                {"messages": [HumanMessage(content=query)]},
+                config=config,
+                stream_mode="messages",
+            ):
+                if isinstance(chunk, AIMessageChunk) and metadata.get("langgraph_node") == "model" and chunk.content:
+                    yield chunk.content
 
+            chat_memory.schedule_summary(self.app, config, as_node="model", store="query")
 
+        async for token in relay_in_background(run_graph):
+            yield token
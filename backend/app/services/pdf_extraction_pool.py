@@ -0,0 +1,406 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pypdf import PdfReader
+
+from app.constents import PDF_PAGE_CACHE_DIR
+from app.core.config import settings
+
+
+class ExtractionQueueFullError(RuntimeError):
+    """Raised when too many PDFs are already waiting for an extraction worker."""
+
+
+class ExtractionTimeoutError(RuntimeError):
+    """Raised when a PDF takes longer than PDF_EXTRACTION_TIMEOUT_SECONDS to parse."""
+
+
+# How often extract() prunes the page cache (pruning runs in a background thread)
+CACHE_PRUNE_INTERVAL_SECONDS = 600
+
+
+def _write_atomic(path: Path, content: str) -> None:
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _cache_page(cache_dir: Path, extraction_mode: str, page_number: int, text: str) -> None:
+    """Best effort: the cache directory may have just been pruned."""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_atomic(_page_cache_path(cache_dir, extraction_mode, page_number), text)
+    except OSError:
+        pass
+
+
+def _page_cache_path(cache_dir: Path, extraction_mode: str, page_number: int) -> Path:
+    return cache_dir / f"{extraction_mode}-{page_number}.txt"
+
+
+def _count_pages(file_path: str, cache_dir: str) -> int:
+    """Worker entry point: read the page count of a PDF and remember it next to the page cache."""
+    count = len(PdfReader(file_path).pages)
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_atomic(Path(cache_dir) / "meta.json", json.dumps({"pages": count}))
+    return count
+
+
+def _extract_pages(
+    file_path: str, page_numbers: List[int], extraction_mode: str, cache_dir: str, submitted_at: float
+) -> Dict[str, Any]:
+    """Worker entry point: parse a range of pages (runs in a child process).
+
+    Every page is written to the page cache as soon as it is parsed, so work done
+    before a timeout or crash is kept for the next attempt.
+    """
+    started_at = time.time()
+    reader = PdfReader(file_path)
+    texts: Dict[int, str] = {}
+    timings: Dict[int, float] = {}
+    for page_number in page_numbers:
+        page_start = time.perf_counter()
+        text = reader.pages[page_number].extract_text(extraction_mode=extraction_mode) or ""
+        timings[page_number] = time.perf_counter() - page_start
+        texts[page_number] = text
+        _cache_page(Path(cache_dir), extraction_mode, page_number, text)
+    return {
+        "texts": texts,
+        "timings": timings,
+        "queue_wait": max(0.0, started_at - submitted_at),
+    }
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _warm_up() -> None:
+    """No-op job that makes the pool spawn its workers ahead of the first upload."""
+
+
+def _directory_size(path: Path) -> int:
+    size = 0
+    for entry in os.scandir(path):
+        try:
+            size += entry.stat().st_size
+        except OSError:
+            pass
+    return size
+
+
+def prune_page_cache(cache_dir: Path, max_bytes: int, max_age_seconds: float) -> Dict[str, int]:
+    """Drop cached files unused for ``max_age_seconds``, then the least recently used
+    ones until the cache is under ``max_bytes``. Each PDF's directory mtime is its
+    last use (pages written, or a cache hit in _read_cache)."""
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.is_dir():
+                    try:
+                        entries.append((entry.stat().st_mtime, Path(entry.path)))
+                    except OSError:
+                        pass
+    except FileNotFoundError:
+        return {"files": 0, "removed": 0, "bytes": 0}
+
+    now = time.time()
+    entries.sort()
+    sizes = {path: _directory_size(path) for _, path in entries}
+    total = sum(sizes.values())
+    removed = 0
+    for last_used, path in entries:
+        if now - last_used <= max_age_seconds and total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= sizes[path]
+        removed += 1
+    return {"files": len(entries) - removed, "removed": removed, "bytes": total}
+
+
+class PDFExtractionPool:
+    """Bounded process pool for CPU-bound PDF parsing.
+
+    Parsing runs in child processes so it never holds the event loop or the GIL
+    of the API worker. At most ``max_pending`` jobs (page ranges) may be queued
+    or running. Jobs are handed to the executor only when a worker is free, so
+    ``timeout`` counts from when a worker starts a job, not from when it queued.
+    A job that exceeds it has the worker processes terminated and the pool is
+    rebuilt, so a malformed PDF cannot hang a worker forever; other jobs that
+    were running in that pool are resubmitted once.
+
+    Large PDFs are split into ranges of ``pages_per_job`` pages parsed in
+    parallel. Page text is cached on disk by (file hash, extraction mode, page),
+    so a retry after a failure, or a request with other options, only parses
+    the pages that are missing. The cache is pruned by age and total size.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.PDF_EXTRACTION_WORKERS,
+        max_pending: int = settings.PDF_EXTRACTION_MAX_PENDING,
+        timeout: float = settings.PDF_EXTRACTION_TIMEOUT_SECONDS,
+        pages_per_job: int = settings.PDF_PAGES_PER_JOB,
+        cache_dir: Path = PDF_PAGE_CACHE_DIR,
+        cache_max_bytes: int = settings.PDF_PAGE_CACHE_MAX_MB * 1024 * 1024,
+        cache_max_age: float = settings.PDF_PAGE_CACHE_MAX_AGE_HOURS * 3600,
+        window: int = 200,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pages_per_job = max(1, pages_per_job)
+        self.cache_dir = Path(cache_dir)
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_max_age = cache_max_age
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Incremented per executor, so a late failure handler never resets a newer pool
+        self._generation = 0
+        # One job per worker process at a time: queueing happens here, not in the executor
+        self._slots = asyncio.Semaphore(max(1, workers))
+        self._last_prune = 0.0
+        self._prune_task: Optional[asyncio.Task] = None
+        self.pending = 0
+        self.jobs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.resubmitted = 0
+        self.cached_pages = 0
+        self.parsed_pages = 0
+        self.queue_waits: deque = deque(maxlen=window)
+        self.page_times: deque = deque(maxlen=window)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork the API process with its open DB pools and threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            self._generation += 1
+        return self._executor
+
+    async def start(self) -> None:
+        """Spawn the worker processes now so the first uploads don't pay the start-up cost."""
+        executor = self._get_executor()
+        await asyncio.gather(
+            *(asyncio.wrap_future(executor.submit(_warm_up)) for _ in range(self.workers)),
+            return_exceptions=True,
+        )
+        print(f"✅ PDF extraction workers started ({self.workers})")
+        self._schedule_prune()
+
+    def _reset(self, generation: int) -> None:
+        """Kill the worker processes; a timed-out parse cannot be cancelled otherwise.
+
+        Only the executor of ``generation`` is reset: if it was already replaced
+        (another job's failure got here first), the newer pool is left alone.
+        """
+        if generation != self._generation or self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        self.restarts += 1
+        print("⚠️ PDF extraction pool restarted")
+
+    async def _run(self, fn, *args) -> Any:
+        """Run one job in the pool with the per-job timeout.
+
+        A job that was running in a pool that broke or was reset is resubmitted
+        once; any pages it finished are cached, so the retry skips them.
+        """
+        for attempt in range(2):
+            async with self._slots:
+                executor = self._get_executor()
+                generation = self._generation
+                future = executor.submit(fn, *args)
+                try:
+                    return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    self._reset(generation)
+                    raise ExtractionTimeoutError(f"PDF extraction timed out after {self.timeout:g}s")
+                except asyncio.CancelledError:
+                    # Our own cancellation propagates; a future cancelled by a pool reset is retried
+                    if asyncio.current_task().cancelling() or not future.cancelled():
+                        raise
+                    error: Exception = RuntimeError("PDF extraction pool was restarted")
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. killed by the OOM killer, or by a reset for another
+                    # job's timeout); start fresh for the next job
+                    self._reset(generation)
+                    error = e
+                except Exception:
+                    self.failures += 1
+                    raise
+            if attempt == 0:
+                self.resubmitted += 1
+        self.failures += 1
+        raise ValueError(f"PDF extraction worker crashed: {error}") from error
+
+    def _read_cache(self, cache_dir: Path, extraction_mode: str) -> Dict[str, Any]:
+        """Page count and already extracted pages for one file (runs in a thread)."""
+        try:
+            count = json.loads((cache_dir / "meta.json").read_text())["pages"]
+            # Mark the file as recently used for pruning
+            os.utime(cache_dir)
+        except (OSError, ValueError, KeyError):
+            return {"pages": None, "texts": {}}
+        texts = {}
+        for page_number in range(count):
+            path = _page_cache_path(cache_dir, extraction_mode, page_number)
+            if path.exists():
+                texts[page_number] = path.read_text(encoding="utf-8")
+        return {"pages": count, "texts": texts}
+
+    def _schedule_prune(self) -> None:
+        """Prune the page cache in a background thread, at most every CACHE_PRUNE_INTERVAL_SECONDS."""
+        now = time.monotonic()
+        if self._prune_task is not None and not self._prune_task.done():
+            return
+        if self._last_prune and now - self._last_prune < CACHE_PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+        self._prune_task = asyncio.create_task(self._prune())
+
+    async def _prune(self) -> None:
+        try:
+            result = await asyncio.to_thread(prune_page_cache, self.cache_dir, self.cache_max_bytes, self.cache_max_age)
+            if result["removed"]:
+                print(f"PDF page cache pruned: {result['removed']} files removed, {result['files']} kept "
+                      f"({result['bytes'] / (1024 * 1024):.1f} MB)")
+        except Exception as e:
+            print(f"⚠️ PDF page cache pruning failed: {e}")
+
+    def _admit(self, jobs: int) -> None:
+        """Reserve queue slots for ``jobs`` jobs; a single PDF is always admitted into an empty queue."""
+        if self.pending and self.pending + jobs > self.max_pending:
+            self.rejected += 1
+            raise ExtractionQueueFullError("Too many PDFs are being processed, please retry shortly")
+        self.pending += jobs
+
+    async def extract(
+        self, file_path: str, content_hash: Optional[str] = None, extraction_mode: str = "plain"
+    ) -> Dict[str, Any]:
+        """
+        Parse a PDF in the pool, reusing cached pages.
+
+        Returns:
+            pages: text per page, in order
+            page_timings_ms: parse time per page (None for pages served from the cache)
+            cached_pages: how many pages came from the cache
+        """
+        # Fail fast before hashing the file when the queue is already full
+        self._admit(1)
+        admitted = 1
+        try:
+            self._schedule_prune()
+            file_path = str(file_path)
+            content_hash = content_hash or await asyncio.to_thread(file_sha256, file_path)
+            cache_dir = self.cache_dir / content_hash
+            cached = await asyncio.to_thread(self._read_cache, cache_dir, extraction_mode)
+
+            page_count = cached["pages"]
+            if page_count is None:
+                page_count = await self._run(_count_pages, file_path, str(cache_dir))
+
+            texts: Dict[int, str] = dict(cached["texts"])
+            timings: Dict[int, float] = {}
+            missing = [page_number for page_number in range(page_count) if page_number not in texts]
+            ranges = [missing[i:i + self.pages_per_job] for i in range(0, len(missing), self.pages_per_job)]
+
+            # Every range is a job of its own; the reservation made above covers the first one
+            self.pending -= admitted
+            admitted = 0
+            self._admit(len(ranges))
+            admitted = len(ranges)
+
+            results = await asyncio.gather(
+                *(
+                    self._run(_extract_pages, file_path, page_range, extraction_mode, str(cache_dir), time.time())
+                    for page_range in ranges
+                ),
+                return_exceptions=True,
+            )
+            errors = [result for result in results if isinstance(result, BaseException)]
+            if errors:
+                # Finished ranges are already cached; a retry only parses what is still missing.
+                # CancelledError is not an Exception and would escape callers' handlers, so it is mapped.
+                raise next(
+                    (error for error in errors if isinstance(error, Exception)),
+                    ValueError("PDF extraction was interrupted, please retry"),
+                )
+        finally:
+            self.pending -= admitted
+
+        for result in results:
+            texts.update(result["texts"])
+            timings.update(result["timings"])
+            self.queue_waits.append(result["queue_wait"])
+            self.page_times.extend(result["timings"].values())
+
+        self.jobs += 1
+        self.cached_pages += len(cached["texts"])
+        self.parsed_pages += len(timings)
+        return {
+            "pages": [texts[page_number] for page_number in range(page_count)],
+            "page_timings_ms": [
+                round(timings[page_number] * 1000, 1) if page_number in timings else None
+                for page_number in range(page_count)
+            ],
+            "cached_pages": len(cached["texts"]),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+
+    @staticmethod
+    def _percentile(values: List[float], q: float) -> Optional[float]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self.pending,
+            "jobs": self.jobs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "resubmitted": self.resubmitted,
+            "parsed_pages": self.parsed_pages,
+            "cached_pages": self.cached_pages,
+            "queue_wait_p50_ms": self._percentile(list(self.queue_waits), 50),
+            "queue_wait_p95_ms": self._percentile(list(self.queue_waits), 95),
+            "parse_ms_per_page_p50": self._percentile(list(self.page_times), 50),
+            "parse_ms_per_page_p95": self._percentile(list(self.page_times), 95),
+        }
+
+
+pdf_extraction_pool = PDFExtractionPool()
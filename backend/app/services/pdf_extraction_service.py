@@ -1,8 +1,7 @@
-from typing import Any, Dict
-from langchain_community.document_loaders import PyPDFLoader
-from app.db.vector_store import build_chroma_from_text
+from typing import Any, Dict, Optional
+from app.db.vector_store import RESUME_COLLECTION
 from app.services.base_service import BaseService
-from uuid import uuid4
+from app.services.pdf_extraction_pool import ExtractionTimeoutError, pdf_extraction_pool
 from app.schemas.common import PDFExtractionResponse
 
 class PDFExtractionService(BaseService):
@@ -11,19 +10,25 @@ class PDFExtractionService(BaseService):
     def __init__(self):
         super().__init__()
 
-    async def process(self, file_path: str) -> Dict[str, Any]:
-        loader = PyPDFLoader(file_path)
-        pages = loader.load()
-        full_text = "\n".join([page.page_content for page in pages])
-        # Disabling this resume vector embedding
-        # collection_name = f"resumes_{uuid4().hex[:8]}"
-        # vector_db = build_chroma_from_text(full_text, collection_name=collection_name)
-        # print(vector_db)
-
+    async def process(
+        self, file_path: str, content_hash: Optional[str] = None, extraction_mode: str = "plain"
+    ) -> Dict[str, Any]:
+        # Parsing is CPU-bound, so it runs in the process pool rather than on the event loop
+        try:
+            result = await pdf_extraction_pool.extract(
+                file_path, content_hash=content_hash, extraction_mode=extraction_mode
+            )
+        except ExtractionTimeoutError as e:
+            return self.format_response(message=str(e), data=None, success=False)
+
+        pages = result["pages"]
+        full_text = "\n".join(pages)
+        # Chunks are indexed into the shared resume collection once the resume row exists (see upload)
         data = PDFExtractionResponse(
-            collection_name="VECTOR DB DISABLED!",
+            collection_name=RESUME_COLLECTION,
             pages=len(pages),
             full_text=full_text,
+            page_timings_ms=result["page_timings_ms"],
         )
 
         return self.format_response(
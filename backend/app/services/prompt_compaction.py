@@ -0,0 +1,215 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Pattern
+
+import tiktoken
+
+from app.core.config import settings
+from app.external import llm
+from app.services.skill_lexicon import get_skill_lexicon
+
+# Bump whenever the compaction rules change; it is part of cache keys for compacted prompts
+COMPACTION_VERSION = "compaction-v2"
+
+# Paragraphs longer than this are scored sentence by sentence
+_SENTENCE_SPLIT_TOKENS = 80
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;])\s+|\s*[•·▪●]\s*")
+_REQUIREMENT_WORDS = re.compile(
+    r"\b(required|requirements?|must|should|proficien\w*|experience (with|in)|knowledge of|familiar\w*|"
+    r"expertise|hands-on|degree|years?|qualifications?|responsib\w*|skills?)\b"
+)
+# A line containing these is a list (e.g. "AWS, GCP, SQL"), never a heading
+_LIST_SEPARATORS = re.compile(r"[,;|•·▪●]")
+# Section names common to any document; all-caps lines only count as headings if they name a section
+_GENERIC_HEADINGS = re.compile(
+    r"\b(summary|profile|objective|overview|about|role|position|duties|contact|languages|awards|"
+    r"achievements|publications|volunteer\w*|activities|additional information)\b"
+)
+
+
+class CompactionProfile:
+    """Rules for one kind of document: which headings matter, what is boilerplate."""
+
+    def __init__(self, name: str, priority_headings: str, drop_headings: str, boilerplate: str):
+        self.name = name
+        self.priority_headings: Pattern = re.compile(priority_headings)
+        self.drop_headings: Pattern = re.compile(drop_headings)
+        self.boilerplate: Pattern = re.compile(boilerplate)
+
+
+JOB_PROFILE = CompactionProfile(
+    name="job_description",
+    priority_headings=r"requirement|qualification|skill|must have|nice to have|preferred|responsibilit|what you.?ll do|what we.?re looking for|experience|tech stack",
+    drop_headings=r"\bbenefits?\b|\bperks?\b|what we offer|why join|about (us|the company)|who we are|equal (employment )?opportunit|\beeo\b|how to apply|\bcompensation\b",
+    # Phrases, not bare words: "dental" or "wellness" alone also appear in real requirements
+    boilerplate=(
+        r"\bequal (employment )?opportunity\b|\bwithout regard to\b|\brace, colou?r\b|\bsexual orientation\b|"
+        r"\bgender identity\b|\bprotected veteran\b|\bdisability status\b|\be-verify\b|"
+        r"\breasonable accommodations?\b|\baffirmative action\b|"
+        r"\b401\s*\(?k\)?(?!\w)|\bpaid time off\b|\bpto\b|\bparental leave\b|\btuition reimbursement\b|"
+        r"\b(medical|health|dental|vision|life)(,? (and |& )?(medical|health|dental|vision|life))* (insurance|coverage|benefits)\b|"
+        r"\bwellness (programs?|stipends?|allowances?|benefits?)\b|\bcommuter (benefits?|stipends?|allowances?|subsid\w*)\b|"
+        r"\bstock options? (plan|grants?|package)\b|\bbenefits package\b"
+    ),
+)
+
+RESUME_PROFILE = CompactionProfile(
+    name="resume",
+    priority_headings=r"skill|experience|employment|work history|project|technolog|certification|education",
+    drop_headings=r"references|hobbies|interests|declaration|personal details",
+    boilerplate=r"references (are )?available (up)?on request|i hereby declare|date of birth|marital status",
+)
+
+
+class _Segment:
+    def __init__(self, order: int, heading: str, text: str, tokens: int, score: float):
+        self.order = order
+        self.heading = heading
+        self.text = text
+        self.tokens = tokens
+        self.score = score
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Optional[tiktoken.Encoding]:
+    model_name = getattr(llm, "tiktoken_model_name", None) or getattr(llm, "model_name", "")
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name.split("/")[-1])
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encoding files unavailable (e.g. offline); fall back to a character estimate
+        print(f"tiktoken encoding unavailable, estimating tokens from length: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Number of tokens text costs for the configured chat model."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _is_heading(line: str, profile: CompactionProfile) -> bool:
+    words = line.split()
+    if not words or len(words) > 6 or len(line) > 60:
+        return False
+    if line.startswith("#"):
+        return True
+    if _LIST_SEPARATORS.search(line):
+        return False
+    if line.endswith(":"):
+        return True
+    if line.isupper():
+        # Acronym lines ("AWS GCP SQL") are upper case too; require a known section name
+        lowered = line.lower()
+        return bool(
+            profile.priority_headings.search(lowered)
+            or profile.drop_headings.search(lowered)
+            or _GENERIC_HEADINGS.search(lowered)
+        )
+    return False
+
+
+def _split_segments(text: str, profile: CompactionProfile) -> List[_Segment]:
+    lexicon = get_skill_lexicon()
+    segments: List[_Segment] = []
+    heading = ""
+    paragraph: List[str] = []
+
+    def score(unit: str, tokens: int) -> float:
+        lowered = unit.lower()
+        if profile.boilerplate.search(lowered) or (heading and profile.drop_headings.search(heading.lower())):
+            return -1.0
+        value = 2.0 * len(lexicon.scan(unit)) + len(_REQUIREMENT_WORDS.findall(lowered))
+        if heading and profile.priority_headings.search(heading.lower()):
+            value += 3.0
+        # Information per token, so short dense lines beat long vague paragraphs
+        return value / max(tokens, 1)
+
+    def flush() -> None:
+        if not paragraph:
+            return
+        block = " ".join(paragraph)
+        paragraph.clear()
+        tokens = count_tokens(block)
+        units = [block] if tokens <= _SENTENCE_SPLIT_TOKENS else [u for u in _SENTENCE_BOUNDARY.split(block) if u.strip()]
+        for unit in units:
+            unit_tokens = tokens if len(units) == 1 else count_tokens(unit)
+            segments.append(_Segment(len(segments), heading, unit.strip(), unit_tokens, score(unit, unit_tokens)))
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            flush()
+        elif _is_heading(line, profile):
+            flush()
+            heading = line.lstrip("#").rstrip(":").strip()
+        else:
+            paragraph.append(line)
+    flush()
+    return segments
+
+
+def _truncate_to_tokens(text: str, budget: int) -> str:
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[: budget * 4]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+
+
+def compact_text(text: str, budget: int, profile: CompactionProfile, label: str = "") -> str:
+    """Shrink text to at most ``budget`` tokens, keeping its most informative sections.
+
+    Boilerplate (EEO statements, benefits, references...) is always removed. If
+    the rest still exceeds the budget, segments are kept by skill/requirement
+    density and emitted in their original order. A budget of 0 disables compaction.
+    """
+    if not text or budget <= 0:
+        return text
+
+    tokens_before = count_tokens(text)
+    segments = _split_segments(text, profile)
+    useful = [s for s in segments if s.score >= 0]
+
+    if len(useful) == len(segments) and tokens_before <= budget:
+        print(f"[compaction] {label or profile.name}: {tokens_before} tokens (within budget {budget})")
+        return text
+
+    kept: List[_Segment] = []
+    used = 0
+    for segment in sorted(useful, key=lambda s: (-s.score, s.order)):
+        # Reserve a little room for the heading lines re-emitted below
+        cost = segment.tokens + 2
+        if used + cost <= budget:
+            kept.append(segment)
+            used += cost
+
+    lines: List[str] = []
+    current_heading = None
+    for segment in sorted(kept, key=lambda s: s.order):
+        if segment.heading and segment.heading != current_heading:
+            lines.append(f"{segment.heading}:")
+        current_heading = segment.heading
+        lines.append(segment.text)
+    compacted = "\n".join(lines)
+
+    if not compacted and useful:
+        # Nothing fits whole (one huge segment): fall back to the best segment, truncated
+        compacted = _truncate_to_tokens(max(useful, key=lambda s: (s.score, -s.order)).text, budget)
+
+    print(f"[compaction] {label or profile.name}: {tokens_before} -> {count_tokens(compacted)} tokens (budget {budget})")
+    return compacted
+
+
+def compact_job_description(text: str, label: str = "") -> str:
+    return compact_text(text, settings.JOB_DESCRIPTION_TOKEN_BUDGET, JOB_PROFILE, label)
+
+
+def compact_resume(text: str, label: str = "") -> str:
+    return compact_text(text, settings.RESUME_TOKEN_BUDGET, RESUME_PROFILE, label)
@@ -1,7 +1,7 @@
 from typing import Dict, Any
 from app.schemas.query import QueryRequest
 from app.services.base_service import BaseService
-from app.external import llm
+from app.external import llm_gateway
 
 class QueryService(BaseService):
     """Concrete implementation of QueryService for handling query processing logic"""
@@ -88,7 +88,7 @@ class QueryService(BaseService):
         Returns:
             str: The processed result
         """
-        response = llm.invoke(query)
+        response = await llm_gateway.ainvoke(query)
         return response.content
     
     # Additional service-specific methods can be added here
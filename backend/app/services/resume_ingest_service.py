@@ -0,0 +1,291 @@
+import asyncio
+import io
+import os
+import time
+import zipfile
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import UploadFile
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.db.models import RESUME_PREVIEW_LENGTH, ResumeDetails
+from app.db.vector_store import index_resumes
+from app.services.file_upload_service import FileTooLargeError, FileUploadService
+from app.services.pdf_extraction_service import PDFExtractionService
+
+PDF_HEADERS = Headers({"content-type": "application/pdf"})
+
+
+def find_user_resume(db: Session, user_id: int, content_hash: str) -> Optional[ResumeDetails]:
+    """The user's latest resume created from exactly this file, if any."""
+    return db.query(ResumeDetails).filter(
+        ResumeDetails.user_id == user_id,
+        ResumeDetails.content_hash == content_hash,
+    ).order_by(ResumeDetails.resume_id.desc()).first()
+
+
+def find_extracted_text(db: Session, content_hash: str) -> Optional[str]:
+    """Text extracted from an earlier upload of this file (by any user), if any."""
+    row = db.query(ResumeDetails.resume_text).filter(
+        ResumeDetails.content_hash == content_hash,
+        ResumeDetails.resume_text.isnot(None),
+    ).first()
+    return row.resume_text if row else None
+
+
+class ResumeIngestService:
+    """Bulk resume upload pipeline.
+
+    Files (or the PDFs inside zip archives) are streamed to disk one by one
+    while earlier files are already being extracted, at most ``concurrency`` at
+    a time. Extracted resumes are inserted in multi-row INSERT statements of up
+    to ``batch_size`` rows (flushed at least every ``flush_seconds``), and a
+    status dict is yielded per file as soon as its outcome is known.
+    """
+
+    def __init__(
+        self,
+        file_service: FileUploadService,
+        pdf_service: PDFExtractionService,
+        concurrency: int = settings.BULK_UPLOAD_CONCURRENCY,
+        batch_size: int = settings.BULK_INSERT_BATCH_SIZE,
+        flush_seconds: float = settings.BULK_INSERT_FLUSH_SECONDS,
+        max_files: int = settings.BULK_UPLOAD_MAX_FILES,
+    ):
+        self.file_service = file_service
+        self.pdf_service = pdf_service
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.max_files = max_files
+        # Background indexing of inserted batches; outlives the request that started it
+        self._index_tasks: set = set()
+
+    async def _index_batch(self, resumes: List[tuple]) -> None:
+        try:
+            await asyncio.to_thread(index_resumes, resumes)
+        except Exception as e:
+            print(f"Failed to index {len(resumes)} uploaded resumes: {e}")
+
+    def schedule_indexing(self, resumes: List[tuple]) -> None:
+        """Embed a batch of new resumes into the shared resume collection off the request path."""
+        task = asyncio.create_task(self._index_batch(resumes))
+        self._index_tasks.add(task)
+        task.add_done_callback(self._index_tasks.discard)
+
+    @staticmethod
+    def is_zip(file: UploadFile) -> bool:
+        return (file.content_type or "") in ("application/zip", "application/x-zip-compressed") or (
+            (file.filename or "").lower().endswith(".zip")
+        )
+
+    async def _iter_uploads(self, files: List[UploadFile]) -> AsyncIterator[UploadFile]:
+        """Yield every PDF in the request, expanding zip archives member by member."""
+        for file in files:
+            if not self.is_zip(file):
+                yield file
+                continue
+            archive = await asyncio.to_thread(zipfile.ZipFile, file.file)
+            try:
+                for member in archive.infolist():
+                    if member.is_dir() or os.path.basename(member.filename).startswith("."):
+                        continue
+                    name = os.path.basename(member.filename)
+                    if not name.lower().endswith(".pdf"):
+                        yield UploadFile(io.BytesIO(), filename=name, headers=Headers({"content-type": "application/octet-stream"}))
+                        continue
+                    # Members are decompressed while being copied, so the size cap also stops zip bombs
+                    member_file = await asyncio.to_thread(archive.open, member)
+                    try:
+                        yield UploadFile(member_file, filename=name, headers=PDF_HEADERS)
+                    finally:
+                        member_file.close()
+            finally:
+                archive.close()
+
+    async def process(self, user_id: int, files: List[UploadFile]) -> AsyncIterator[Dict[str, Any]]:
+        db = SessionLocal()
+        ready: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: set = set()
+        # content hash -> future resolving to the resume_id created for it in this request
+        created: Dict[str, asyncio.Future] = {}
+        summary = {"created": 0, "duplicate": 0, "error": 0, "skipped": 0, "truncated": 0}
+
+        async def extract(item: Dict[str, Any], path: str) -> None:
+            try:
+                async with semaphore:
+                    result = await self.pdf_service.process(path, content_hash=item["sha256"])
+                if not result.get("success"):
+                    raise ValueError(result.get("message", "Error extracting PDF text"))
+                item["resume_text"] = result["data"].full_text
+                item["pages_processed"] = result["data"].pages
+                ready.put_nowait(item)
+            except Exception as e:
+                created[item["sha256"]].cancel()
+                ready.put_nowait({**item, "status": "error", "detail": f"Error processing PDF: {str(e)}"})
+
+        async def await_original(item: Dict[str, Any], original: asyncio.Future) -> None:
+            try:
+                item["resume_id"] = await original
+                ready.put_nowait({**item, "status": "duplicate"})
+            except (asyncio.CancelledError, Exception):
+                ready.put_nowait({**item, "status": "error", "detail": "Identical file in this upload failed"})
+
+        def spawn(coro) -> None:
+            task = asyncio.create_task(coro)
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        async def ingest() -> None:
+            index = 0
+            uploads = self._iter_uploads(files)
+            try:
+                async for upload in uploads:
+                    if index >= self.max_files:
+                        # One line for the whole remainder rather than one per ignored file
+                        ready.put_nowait({
+                            "index": index,
+                            "file": upload.filename,
+                            "status": "truncated",
+                            "detail": f"Upload limit of {self.max_files} files reached; this and any later files were not processed",
+                        })
+                        break
+                    item = {"index": index, "file": upload.filename}
+                    index += 1
+                    try:
+                        upload_result = await self.file_service.process(upload)
+                    except FileTooLargeError as e:
+                        ready.put_nowait({**item, "status": "error", "detail": str(e)})
+                        continue
+                    except Exception as e:
+                        ready.put_nowait({**item, "status": "error", "detail": f"Error saving file: {str(e)}"})
+                        continue
+                    if not upload_result.get("success"):
+                        ready.put_nowait({**item, "status": "skipped", "detail": upload_result.get("message")})
+                        continue
+
+                    stored = upload_result["data"]
+                    item.update(sha256=stored.sha256, path=stored.path, size=stored.size)
+
+                    existing = find_user_resume(db, user_id, stored.sha256)
+                    if existing:
+                        ready.put_nowait({**item, "status": "duplicate", "resume_id": existing.resume_id})
+                    elif stored.sha256 in created:
+                        spawn(await_original(item, created[stored.sha256]))
+                    else:
+                        created[stored.sha256] = asyncio.get_running_loop().create_future()
+                        text = find_extracted_text(db, stored.sha256)
+                        if text is not None:
+                            ready.put_nowait({**item, "resume_text": text, "reused_text": True})
+                        else:
+                            spawn(extract(item, stored.path))
+            except Exception as e:
+                # e.g. a corrupt zip archive; files already handed off still complete
+                ready.put_nowait({"index": index, "file": None, "status": "error", "detail": f"Error reading upload: {str(e)}"})
+            finally:
+                # Closes the open zip archive if the file limit cut the iteration short
+                await uploads.aclose()
+                while tasks:
+                    await asyncio.gather(*list(tasks))
+                ready.put_nowait(None)
+
+        def insert_rows(items: List[Dict[str, Any]]) -> List[int]:
+            rows = [
+                {
+                    "user_id": user_id,
+                    "file_name": item["file"],
+                    "file_path": item["path"],
+                    "resume_text": item["resume_text"],
+                    # Core inserts skip the model's validator, so the preview is set here
+                    "resume_preview": (item["resume_text"] or "")[:RESUME_PREVIEW_LENGTH] or None,
+                    "content_hash": item["sha256"],
+                }
+                for item in items
+            ]
+            try:
+                resume_ids = db.scalars(
+                    insert(ResumeDetails).returning(ResumeDetails.resume_id, sort_by_parameter_order=True),
+                    rows,
+                ).all()
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            return resume_ids
+
+        def flush(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            statuses = []
+            try:
+                inserted = list(zip(batch, insert_rows(batch)))
+            except Exception:
+                # One bad row fails the whole statement; retry row by row so only that row errors
+                inserted = []
+                for item in batch:
+                    try:
+                        inserted.append((item, insert_rows([item])[0]))
+                    except Exception as e:
+                        created[item["sha256"]].cancel()
+                        statuses.append({**self._public(item), "status": "error", "detail": f"Error saving resume: {str(e)}"})
+
+            if settings.RESUME_RAG_ENABLED and inserted:
+                self.schedule_indexing([
+                    (user_id, resume_id, item["resume_text"]) for item, resume_id in inserted
+                ])
+
+            for item, resume_id in inserted:
+                created[item["sha256"]].set_result(resume_id)
+                statuses.append({
+                    **self._public(item),
+                    "status": "created",
+                    "resume_id": resume_id,
+                    "text_length": len(item["resume_text"] or ""),
+                })
+            return statuses
+
+        producer = asyncio.create_task(ingest())
+        batch: List[Dict[str, Any]] = []
+        batch_started = 0.0
+        try:
+            finished = False
+            while not finished:
+                timeout = None
+                if batch:
+                    timeout = max(0.0, batch_started + self.flush_seconds - time.monotonic())
+                try:
+                    item = await asyncio.wait_for(ready.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    item = False  # flush interval elapsed
+
+                if item is None:
+                    finished = True
+                elif item and "status" not in item:
+                    if not batch:
+                        batch_started = time.monotonic()
+                    batch.append(item)
+                elif item:
+                    summary[item["status"]] += 1
+                    yield self._public(item)
+
+                if batch and (finished or item is False or len(batch) >= self.batch_size):
+                    for status in flush(batch):
+                        summary[status["status"]] += 1
+                        yield status
+                    batch = []
+
+            yield {"status": "done", "summary": summary}
+        finally:
+            producer.cancel()
+            for task in list(tasks):
+                task.cancel()
+            db.close()
+
+    @staticmethod
+    def _public(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Status fields sent to the client (never the full resume text)."""
+        keys = ("index", "file", "status", "resume_id", "sha256", "size", "pages_processed", "reused_text", "detail")
+        return {key: item[key] for key in keys if key in item}
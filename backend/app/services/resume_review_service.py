@@ -1,12 +1,28 @@
-from typing import Any, Dict
+import copy
+import hashlib
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from sqlalchemy.orm import Session
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.utils.json import parse_json_markdown
 from langchain.output_parsers import PydanticOutputParser
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.streaming import relay_in_background
+from app.db.models import ResumeCritique
 from app.schemas.resume_review import (
     ResumeReview,
     ResumeReviewRequest,
 )
 from app.services.base_service import BaseService
-from app.external import llm
+from app.services.prompt_compaction import COMPACTION_VERSION, compact_resume
+from app.external import llm, llm_gateway
+
+# Bump whenever the prompt or output schema changes so cached reviews are invalidated
+PROMPT_VERSION = "resume-review-v1"
+
+# Process-wide LRU in front of the resume_critiques table
+_review_cache = LRUCache(maxsize=settings.REVIEW_CACHE_SIZE)
 
 
 class ResumeReviewService(BaseService):
@@ -27,30 +43,157 @@ Resume:
             """
         )
 
-    async def process(self, request: ResumeReviewRequest) -> Dict[str, Any]:
+    async def process(self, request: ResumeReviewRequest, db: Optional[Session] = None) -> Dict[str, Any]:
         if not await self.validate(request):
             return self.format_response(
                 message="Resume text is required",
                 data=None,
                 success=False,
             )
-        
-        chain = self.prompt | llm | self.parser
 
-        result: ResumeReview = chain.invoke(
+        content_hash = self.review_cache_key(request.resume_text)
+
+        # Serve identical resumes from the cache (memory first, then resume_critiques)
+        if db is not None:
+            cached = self.get_cached_review(db, content_hash)
+            if cached is not None:
+                return self.format_response(
+                    message="Resume reviewed successfully",
+                    data={"review": cached, "content_hash": content_hash, "cached": True},
+                    success=True,
+                )
+
+        chain = self.prompt | llm_gateway.as_runnable() | self.parser
+
+        result: ResumeReview = await chain.ainvoke(
             {
-                "resume_text": request.resume_text,
+                "resume_text": compact_resume(request.resume_text, label="resume review"),
                 "format_instructions": self.parser.get_format_instructions(),
             }
         )
 
         return self.format_response(
             message="Resume reviewed successfully",
-            data={"review": result.model_dump()},
+            data={"review": result.model_dump(), "content_hash": content_hash, "cached": False},
             success=True,
         )
 
+    async def stream_review(
+        self, request: ResumeReviewRequest, user_id: int, resume_id: int
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream a review as ("field", {name, value}) events followed by one ("done", data) event.
+
+        The JSON completion is parsed incrementally and each ResumeReview field is
+        emitted once the model has moved past it. The validated review is saved to
+        resume_critiques at the end; generation runs in a detached task so that
+        happens even if the client disconnects. Cache hits are emitted at once.
+        """
+
+        async def run() -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+            db = SessionLocal()
+            try:
+                content_hash = self.review_cache_key(request.resume_text)
+                review = self.get_cached_review(db, content_hash)
+                cached = review is not None
+                emitted = set()
+
+                if not cached:
+                    prompt_value = self.prompt.invoke(
+                        {
+                            "resume_text": compact_resume(request.resume_text, label="resume review stream"),
+                            "format_instructions": self.parser.get_format_instructions(),
+                        }
+                    )
+                    text = ""
+                    async for chunk in llm_gateway.astream(prompt_value):
+                        piece = chunk.content if isinstance(chunk.content, str) else ""
+                        text += piece
+                        # A field can only complete when a separator or closing bracket arrives
+                        if not any(c in piece for c in ",]}"):
+                            continue
+                        try:
+                            partial = parse_json_markdown(text)
+                        except Exception:
+                            continue
+                        if not isinstance(partial, dict):
+                            continue
+                        # Every key but the last one is final; the last may still be growing
+                        for name in list(partial)[:-1]:
+                            if name in ResumeReview.model_fields and name not in emitted:
+                                emitted.add(name)
+                                yield "field", {"name": name, "value": partial[name]}
+
+                    review = self.parser.parse(text).model_dump()
+
+                for name, value in review.items():
+                    if name not in emitted:
+                        yield "field", {"name": name, "value": value}
+
+                self.save_review(db, user_id=user_id, resume_id=resume_id, review=review, content_hash=content_hash)
+                yield "done", {"review": review, "content_hash": content_hash, "cached": cached}
+            finally:
+                db.close()
+
+        async for event in relay_in_background(run):
+            yield event
+
     async def validate(self, request: ResumeReviewRequest) -> bool:
         return bool(request and isinstance(request.resume_text, str) and request.resume_text.strip())
 
+    def review_cache_key(self, resume_text: str) -> str:
+        """Hash of (resume text, prompt version, model name, compaction settings) used as the review cache key."""
+        model_name = getattr(llm, "model_name", "") or ""
+        compaction = f"{COMPACTION_VERSION}:{settings.RESUME_TOKEN_BUDGET}"
+        payload = "\x1f".join([PROMPT_VERSION, model_name, compaction, resume_text.strip()])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_cached_review(self, db: Session, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Return a previously computed review for this cache key, if any."""
+        cached = _review_cache.get(content_hash)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        critique = (
+            db.query(ResumeCritique)
+            .filter(ResumeCritique.content_hash == content_hash)
+            .order_by(ResumeCritique.created_at.desc())
+            .first()
+        )
+        if not critique:
+            return None
+
+        _review_cache.set(content_hash, critique.review)
+        return copy.deepcopy(critique.review)
+
+    def save_review(
+        self,
+        db: Session,
+        user_id: int,
+        resume_id: int,
+        review: Dict[str, Any],
+        content_hash: str,
+    ) -> ResumeCritique:
+        """Persist a review for a resume unless it is already the resume's latest critique."""
+        latest = (
+            db.query(ResumeCritique)
+            .filter(ResumeCritique.resume_id == resume_id, ResumeCritique.user_id == user_id)
+            .order_by(ResumeCritique.created_at.desc())
+            .first()
+        )
+        if latest and latest.content_hash == content_hash:
+            return latest
+
+        critique = ResumeCritique(
+            user_id=user_id,
+            resume_id=resume_id,
+            review=review,
+            content_hash=content_hash,
+            prompt_version=PROMPT_VERSION,
+            model_name=getattr(llm, "model_name", None),
+        )
+        db.add(critique)
+        db.commit()
 
+        _review_cache.set(content_hash, review)
+        return critique
@@ -0,0 +1,212 @@
+import asyncio
+import hashlib
+from typing import AbstractSet, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import JsonOutputParser
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.db.models import JobSkillExtraction
+from app.external import llm_gateway
+from app.services.prompt_compaction import COMPACTION_VERSION, compact_job_description
+from app.services.skill_lexicon import get_skill_lexicon
+
+# Bump whenever an extraction prompt changes; stored rows from other versions are treated as misses.
+# LLM prompts see the compacted description, so the compaction rules and budget are part of the version.
+_COMPACTION = f"{COMPACTION_VERSION}:{settings.JOB_DESCRIPTION_TOKEN_BUDGET}"
+SKILL_PROMPT_VERSION = f"job-skills-v1+{_COMPACTION}"
+BATCH_PROMPT_VERSION = f"job-skills-batch-v1+{_COMPACTION}"
+LOCAL_EXTRACTOR_VERSION = "job-skills-lexicon-v1"
+# Only these count as stored LLM results; lexicon rows (--local batch runs) never stand in for the LLM
+LLM_PROMPT_VERSIONS = frozenset({SKILL_PROMPT_VERSION, BATCH_PROMPT_VERSION})
+ACCEPTED_PROMPT_VERSIONS = LLM_PROMPT_VERSIONS | {LOCAL_EXTRACTOR_VERSION}
+
+# Below this many lexicon hits the job description is sent to the LLM even without enrichment enabled
+MIN_LEXICON_SKILLS = 3
+
+# In-flight extractions per (job_id, description_hash), shared across requests in this process
+_inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+
+
+def description_hash(job_description: str) -> str:
+    """Stable hash of a job description used as part of the skill store key."""
+    return hashlib.sha256(job_description.strip().encode("utf-8")).hexdigest()
+
+
+class SkillExtractionService:
+    """Extracts required skills from job descriptions, backed by the job_skill_extractions table."""
+
+    def __init__(self):
+        self.prompt = PromptTemplate.from_template("""
+            Extract technical and professional skills required for this job. Be comprehensive and specific.
+
+            Job Description: {job_description}
+
+            Return only JSON with a "skills" array containing specific technologies, frameworks, tools, and skills.
+            Include both technical and soft skills. Focus on requirements explicitly mentioned or strongly implied.
+            Be precise - don't add generic skills unless clearly required.
+
+            Examples of what to extract:
+            - Programming languages (Python, JavaScript, TypeScript)
+            - Frameworks (React, Next.js, NestJS, Django)
+            - Tools (Docker, Kubernetes, Git, AWS)
+            - Methodologies (Agile, TDD, CI/CD)
+            - Soft skills (Communication, Leadership, Problem-solving)
+
+            Response format: {{"skills": ["skill1", "skill2", "skill3", ...]}}
+            """)
+
+        self.batch_prompt = PromptTemplate.from_template("""
+            Extract the technical and professional skills required for EACH of the jobs below.
+            Be specific: programming languages, frameworks, tools, methodologies and soft skills that are
+            explicitly required or strongly implied. Don't add generic skills unless clearly required.
+
+            {jobs}
+
+            Return only JSON with one entry per job, using the job ids exactly as given.
+            Response format: {{"jobs": [{{"job_id": "...", "skills": ["skill1", "skill2", ...]}}]}}
+            """)
+
+    async def extract_llm(self, job_description: str) -> List[str]:
+        """Call the LLM to extract skills from a single job description."""
+        chain = self.prompt | llm_gateway.as_runnable() | JsonOutputParser()
+        result = await chain.ainvoke({"job_description": compact_job_description(job_description, label="job skills")})
+        return [s for s in result.get("skills", []) if isinstance(s, str) and s.strip()]
+
+    async def extract_llm_batch(self, jobs: Sequence[Tuple[str, str]]) -> Dict[str, List[str]]:
+        """Extract skills for several (job_id, description) pairs with a single LLM request.
+
+        Jobs missing from the model's answer are simply absent from the result.
+        """
+        jobs_block = "\n\n".join(
+            f"### Job {job_id}\n{compact_job_description(description, label=f'job {job_id} skills')}"
+            for job_id, description in jobs
+        )
+        chain = self.batch_prompt | llm_gateway.as_runnable() | JsonOutputParser()
+        result = await chain.ainvoke({"jobs": jobs_block})
+
+        wanted = {str(job_id) for job_id, _ in jobs}
+        extracted: Dict[str, List[str]] = {}
+        for entry in result.get("jobs", []):
+            job_id = str(entry.get("job_id", "")).strip()
+            if job_id in wanted:
+                extracted[job_id] = [s for s in entry.get("skills", []) if isinstance(s, str) and s.strip()]
+        return extracted
+
+    def extract_local(self, job_description: str) -> List[str]:
+        """Deterministic extraction with the skill lexicon (no LLM call); returns canonical names."""
+        lexicon = get_skill_lexicon()
+        return [lexicon.name(skill_id) for skill_id in lexicon.scan(job_description)]
+
+    async def extract_job_skills(self, db: Session, job_id: str, job_description: str) -> Tuple[List[str], str]:
+        """Lexicon extraction, optionally enriched with (stored or fresh) LLM extraction.
+
+        The LLM is consulted when SKILL_LLM_ENRICHMENT is on, or when the lexicon
+        finds too few skills to build a plan from. Returns canonical skill names
+        and a label describing where they came from.
+        """
+        lexicon = get_skill_lexicon()
+        skills = self.extract_local(job_description)
+        source = "lexicon"
+
+        if settings.SKILL_LLM_ENRICHMENT or len(skills) < MIN_LEXICON_SKILLS:
+            try:
+                llm_skills, llm_source = await self.get_or_extract(db, job_id, job_description)
+            except Exception:
+                # Enrichment is optional when the lexicon already found enough
+                if len(skills) < MIN_LEXICON_SKILLS:
+                    raise
+                llm_skills, llm_source = [], None
+
+            known = {lexicon.skill_id(skill) for skill in skills}
+            for skill in llm_skills:
+                skill_id = lexicon.skill_id(skill)
+                if skill_id not in known:
+                    known.add(skill_id)
+                    skills.append(lexicon.canonical_name(skill))
+            if llm_source:
+                source = f"lexicon+{llm_source}"
+
+        return skills, source
+
+    def get_stored_skills(
+        self, db: Session, job_id: str, desc_hash: str, accepted: AbstractSet[str] = LLM_PROMPT_VERSIONS
+    ) -> Optional[List[str]]:
+        """Return stored skills for this job/description if extracted with one of the ``accepted`` versions.
+
+        The default only accepts LLM extractions: lexicon output is recomputed on
+        every call anyway, so a stored lexicon row is never a substitute for the LLM.
+        """
+        row = db.query(JobSkillExtraction).filter(
+            JobSkillExtraction.job_id == job_id,
+            JobSkillExtraction.description_hash == desc_hash,
+        ).first()
+        if row and row.prompt_version in accepted:
+            return list(row.skills)
+        return None
+
+    def save_skills(
+        self,
+        db: Session,
+        job_id: str,
+        desc_hash: str,
+        skills: List[str],
+        prompt_version: str = SKILL_PROMPT_VERSION,
+        source: str = "llm",
+    ) -> None:
+        """Upsert extracted skills for a job description."""
+        stmt = insert(JobSkillExtraction).values(
+            job_id=job_id,
+            description_hash=desc_hash,
+            prompt_version=prompt_version,
+            source=source,
+            skills=skills,
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_job_skill_extractions_job_hash",
+            set_={
+                "prompt_version": stmt.excluded.prompt_version,
+                "source": stmt.excluded.source,
+                "skills": stmt.excluded.skills,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+
+    async def _extract_and_store(self, job_id: str, desc_hash: str, job_description: str) -> List[str]:
+        skills = await self.extract_llm(job_description)
+        if skills:
+            # Own session: the task may outlive the request that started it
+            db = SessionLocal()
+            try:
+                self.save_skills(db, job_id, desc_hash, skills)
+            finally:
+                db.close()
+        return skills
+
+    async def get_or_extract(self, db: Session, job_id: str, job_description: str) -> Tuple[List[str], str]:
+        """Read skills from the store, calling the LLM only on a miss.
+
+        Concurrent misses for the same job description share one LLM call.
+        Returns the skills and where they came from ("store" or "llm").
+        """
+        job_id = str(job_id)
+        desc_hash = description_hash(job_description)
+
+        stored = self.get_stored_skills(db, job_id, desc_hash)
+        if stored is not None:
+            return stored, "store"
+
+        key = (job_id, desc_hash)
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._extract_and_store(job_id, desc_hash, job_description))
+            _inflight[key] = task
+            task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+        # Shield so one cancelled waiter does not cancel the extraction for everyone else
+        skills = await asyncio.shield(task)
+        return list(skills), "llm"
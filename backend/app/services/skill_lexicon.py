@@ -0,0 +1,153 @@
+import json
+import re
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+SKILL_TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skill_taxonomy.json"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text.lower()).strip()
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton for matching many patterns in one linear pass over the text."""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Per state: (pattern length, value) for every pattern ending here
+        self.output: List[List[Tuple[int, Any]]] = [[]]
+
+    def add(self, pattern: str, value: Any) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((len(pattern), value))
+
+    def build(self) -> "AhoCorasick":
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (start, end, value) for every pattern occurrence in text."""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for length, value in self.output[state]:
+                yield index - length + 1, index + 1, value
+
+
+class SkillLexicon:
+    """Skill taxonomy with canonical ids and aliases.
+
+    ``scan`` finds skills mentioned anywhere in free text (job descriptions,
+    critique sentences); ``normalize`` maps a single skill string such as
+    "ReactJS" to its canonical id so both sides of a gap computation agree.
+    """
+
+    def __init__(self, skills: Iterable[Dict[str, Any]]):
+        self.names: Dict[str, str] = {}
+        self.exact: Dict[str, str] = {}
+        self.automaton = AhoCorasick()
+
+        for skill in skills:
+            skill_id = skill["id"]
+            self.names[skill_id] = skill["name"]
+
+            scanned = list(skill.get("aliases", []))
+            if skill.get("scan_name", True):
+                scanned.append(skill["name"])
+
+            for alias in [skill["name"], skill_id] + scanned + list(skill.get("exact_aliases", [])):
+                self.exact.setdefault(_normalize_text(alias), skill_id)
+            for alias in scanned:
+                pattern = _normalize_text(alias)
+                if len(pattern) >= 2:
+                    self.automaton.add(pattern, skill_id)
+
+        self.automaton.build()
+
+    @classmethod
+    def from_file(cls, path: Path = SKILL_TAXONOMY_PATH) -> "SkillLexicon":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["skills"])
+
+    def name(self, skill_id: str) -> str:
+        """Display name for a canonical id (unknown ids are returned unchanged)."""
+        return self.names.get(skill_id, skill_id)
+
+    def scan(self, text: str) -> List[str]:
+        """Return canonical ids of skills mentioned in text, in order of first appearance."""
+        if not text:
+            return []
+        normalized = _normalize_text(text)
+
+        # Keep the longest whole-word match at each position ("node.js" over "node", "java" not inside "javascript")
+        candidates = []
+        for start, end, skill_id in self.automaton.iter_matches(normalized):
+            if start > 0 and normalized[start - 1].isalnum():
+                continue
+            if end < len(normalized) and normalized[end].isalnum():
+                continue
+            candidates.append((start, -(end - start), end, skill_id))
+        candidates.sort()
+
+        found: List[str] = []
+        covered_until = 0
+        for start, _, end, skill_id in candidates:
+            if start < covered_until:
+                continue
+            covered_until = end
+            if skill_id not in found:
+                found.append(skill_id)
+        return found
+
+    def normalize(self, skill: str) -> Optional[str]:
+        """Map a skill string to its canonical id.
+
+        Tries an exact alias match first, then a scan of the string; returns
+        None when the taxonomy does not know the skill.
+        """
+        key = _normalize_text(skill)
+        if key in self.exact:
+            return self.exact[key]
+        found = self.scan(skill)
+        return found[0] if len(found) == 1 else None
+
+    def canonical_name(self, skill: str) -> str:
+        """Canonical display name for a skill string, or the cleaned-up input if unknown."""
+        skill_id = self.normalize(skill)
+        return self.names[skill_id] if skill_id else _WHITESPACE.sub(" ", skill).strip()
+
+    def skill_id(self, skill: str) -> str:
+        """Canonical id for a skill, falling back to its normalized text for unknown skills."""
+        return self.normalize(skill) or _normalize_text(skill)
+
+
+@lru_cache(maxsize=1)
+def get_skill_lexicon() -> SkillLexicon:
+    """Process-wide lexicon, built once on first use."""
+    return SkillLexicon.from_file()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Checkpoint retention for the chat history tables.
+
+LangGraph writes a new checkpoint on every chat turn and never prunes. This job
+keeps the newest checkpoint(s) of every thread and deletes (or archives) the
+superseded checkpoints, their writes and unreachable channel blobs. It works in
+batches of threads, so it can be stopped and re-run at any time.
+
+Run this from the backend directory:
+    python compact_checkpoints.py --dry-run          # report what would be reclaimed
+    python compact_checkpoints.py                    # keep the latest checkpoint per thread
+    python compact_checkpoints.py --keep 3 --archive # keep 3, move the rest to *_archive tables
+"""
+
+import argparse
+import time
+
+from app.services.checkpoint_maintenance_service import CHECKPOINT_TABLES, CheckpointMaintenanceService
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Prune superseded LangGraph checkpoints.")
+    parser.add_argument("--keep", type=int, default=1, help="Checkpoints to keep per thread (newest first)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Threads compacted per transaction")
+    parser.add_argument("--archive", action="store_true", help="Move pruned rows to <table>_archive instead of deleting them")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be reclaimed")
+    parser.add_argument("--vacuum", action="store_true", help="Run VACUUM (ANALYZE) on the checkpoint tables afterwards")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N threads")
+    return parser.parse_args()
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def main() -> None:
+    args = parse_args()
+    service = CheckpointMaintenanceService(
+        keep=args.keep,
+        batch_size=args.batch_size,
+        archive=args.archive,
+        dry_run=args.dry_run,
+    )
+
+    start_time = time.time()
+    report = service.run(limit=args.limit)
+
+    verb = "Would reclaim" if args.dry_run else ("Archived" if args.archive else "Reclaimed")
+    print(f"\n{verb} from {report['threads']} threads (keeping {args.keep} checkpoint(s) each):")
+    for table in CHECKPOINT_TABLES:
+        print(f"  {table:<18} {report[table]['rows']:>10} rows  {format_bytes(report[table]['bytes']):>10}")
+    print(f"  {'total':<18} {report['total_rows']:>10} rows  {format_bytes(report['total_bytes']):>10}")
+
+    if args.vacuum and not args.dry_run:
+        print("Vacuuming checkpoint tables...")
+        service.vacuum()
+
+    print(f"\n✅ Done in {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Offline batch skill extraction over the whole job corpus.
+
+Walks every posting in the job_postings_v2 collection, extracts required skills
+and writes them to the job_skill_extractions store, so learning-plan generation
+never waits on extraction. Jobs already in the store are skipped, so the job can
+be stopped and re-run at any time.
+
+Run this from the backend directory:
+    python extract_job_skills.py                     # LLM, 5 jobs per request
+    python extract_job_skills.py --local             # deterministic extractor, no LLM
+    python extract_job_skills.py --batch-size 1      # one job per request
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, List, Tuple
+
+from app.core.database import SessionLocal
+from app.services.job_search_service import JobSearchService
+from app.services.skill_extraction_service import (
+    ACCEPTED_PROMPT_VERSIONS,
+    BATCH_PROMPT_VERSION,
+    LLM_PROMPT_VERSIONS,
+    LOCAL_EXTRACTOR_VERSION,
+    SKILL_PROMPT_VERSION,
+    SkillExtractionService,
+    description_hash,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Extract required skills for every job posting.")
+    parser.add_argument("--batch-size", type=int, default=5, help="Job descriptions packed into one LLM request (1 disables packing)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum LLM requests in flight")
+    parser.add_argument("--local", action="store_true", help="Use the local deterministic extractor instead of the LLM")
+    parser.add_argument("--force", action="store_true", help="Re-extract jobs that are already in the store")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N jobs")
+    return parser.parse_args()
+
+
+async def load_pending_jobs(
+    job_service: JobSearchService,
+    skill_service: SkillExtractionService,
+    job_ids: List[Any],
+    force: bool,
+    use_local: bool,
+) -> List[Tuple[str, str, str]]:
+    """Return (job_id, description, description_hash) for jobs missing from the store.
+
+    An LLM run only counts LLM rows as done, so jobs pre-filled with --local are
+    still sent to the LLM. A --local run skips jobs with any row, and never
+    overwrites an LLM row (not even with --force).
+    """
+    pending: List[Tuple[str, str, str]] = []
+    db = SessionLocal()
+    try:
+        for job_id in job_ids:
+            detail = await job_service.get_job_detail(job_id)
+            if not detail.get("success"):
+                continue
+            description = detail["data"]["full_description"]
+            desc_hash = description_hash(description)
+            if use_local and skill_service.get_stored_skills(db, str(job_id), desc_hash, LLM_PROMPT_VERSIONS) is not None:
+                continue
+            accepted = ACCEPTED_PROMPT_VERSIONS if use_local else LLM_PROMPT_VERSIONS
+            if not force and skill_service.get_stored_skills(db, str(job_id), desc_hash, accepted) is not None:
+                continue
+            pending.append((str(job_id), description, desc_hash))
+    finally:
+        db.close()
+    return pending
+
+
+async def process_batch(
+    skill_service: SkillExtractionService,
+    batch: List[Tuple[str, str, str]],
+    use_local: bool,
+    semaphore: asyncio.Semaphore,
+) -> int:
+    """Extract and store skills for one batch. Returns the number of jobs stored."""
+    if use_local:
+        results = {job_id: (skill_service.extract_local(description), LOCAL_EXTRACTOR_VERSION) for job_id, description, _ in batch}
+        source = "local"
+    else:
+        async with semaphore:
+            if len(batch) == 1:
+                job_id, description, _ = batch[0]
+                results = {job_id: (await skill_service.extract_llm(description), SKILL_PROMPT_VERSION)}
+            else:
+                extracted = await skill_service.extract_llm_batch([(job_id, description) for job_id, description, _ in batch])
+                results = {job_id: (skills, BATCH_PROMPT_VERSION) for job_id, skills in extracted.items()}
+        source = "llm"
+
+    stored = 0
+    db = SessionLocal()
+    try:
+        for job_id, _, desc_hash in batch:
+            skills, version = results.get(job_id, ([], None))
+            if not skills:
+                # Left unstored so a later run (or the on-demand path) retries it
+                continue
+            skill_service.save_skills(db, job_id, desc_hash, skills, prompt_version=version, source=source)
+            stored += 1
+    finally:
+        db.close()
+    return stored
+
+
+async def main() -> None:
+    args = parse_args()
+    job_service = JobSearchService()
+    skill_service = SkillExtractionService()
+
+    print("Listing jobs in the vector store...")
+    job_ids = job_service.list_job_ids()
+    if args.limit:
+        job_ids = job_ids[: args.limit]
+    print(f"Found {len(job_ids)} jobs.")
+
+    pending = await load_pending_jobs(job_service, skill_service, job_ids, args.force, args.local)
+    print(f"{len(pending)} jobs need extraction ({len(job_ids) - len(pending)} already in the store).")
+    if not pending:
+        return
+
+    batch_size = 1 if args.local else max(1, args.batch_size)
+    batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+    semaphore = asyncio.Semaphore(max(1, args.concurrency))
+
+    start_time = time.time()
+    done_jobs = 0
+    stored_jobs = 0
+    failed_batches = 0
+
+    async def run_batch(batch: List[Tuple[str, str, str]]) -> Tuple[int, int, Exception | None]:
+        try:
+            return len(batch), await process_batch(skill_service, batch, args.local, semaphore), None
+        except Exception as e:
+            return len(batch), 0, e
+
+    for next_done in asyncio.as_completed([run_batch(batch) for batch in batches]):
+        batch_len, stored, error = await next_done
+        if error is not None:
+            failed_batches += 1
+            print(f"\nBatch failed: {error}")
+        done_jobs += batch_len
+        stored_jobs += stored
+        elapsed = time.time() - start_time
+        rate = done_jobs / elapsed if elapsed > 0 else 0
+        print(f"\rProgress: {done_jobs}/{len(pending)} | Stored: {stored_jobs} | Rate: {rate:.1f} jobs/s", end="", flush=True)
+
+    print(f"\n\n✅ Stored skills for {stored_jobs}/{len(pending)} jobs in {time.time() - start_time:.1f}s "
+          f"({failed_batches} failed batches). Re-run to retry anything missing.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
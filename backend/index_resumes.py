@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Index existing resumes into the shared resume_chunks collection.
+
+New and edited resumes are indexed automatically while RESUME_RAG_ENABLED is on;
+run this once when turning resume RAG on to cover resumes uploaded before. Each
+resume's chunks are replaced, so the job can be stopped and re-run at any time.
+
+Run this from the backend directory:
+    python index_resumes.py                   # every resume, 50 per embedding batch
+    python index_resumes.py --user-id 42      # one user's resumes
+"""
+
+import argparse
+import time
+
+from app.core.database import SessionLocal
+from app.db.models import ResumeDetails
+from app.db.vector_store import index_resumes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Embed resumes into the shared resume chunk collection.")
+    parser.add_argument("--batch-size", type=int, default=50, help="Resumes embedded per batch")
+    parser.add_argument("--user-id", type=int, default=None, help="Only index this user's resumes")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N resumes")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    start_time = time.time()
+    db = SessionLocal()
+    resumes = chunks = 0
+    last_id = 0
+    try:
+        while args.limit is None or resumes < args.limit:
+            size = max(1, args.batch_size)
+            if args.limit is not None:
+                size = min(size, args.limit - resumes)
+            query = db.query(ResumeDetails.user_id, ResumeDetails.resume_id, ResumeDetails.resume_text).filter(
+                ResumeDetails.resume_id > last_id,
+                ResumeDetails.resume_text.isnot(None),
+            )
+            if args.user_id is not None:
+                query = query.filter(ResumeDetails.user_id == args.user_id)
+            batch = query.order_by(ResumeDetails.resume_id).limit(size).all()
+            if not batch:
+                break
+
+            chunks += index_resumes([(row.user_id, row.resume_id, row.resume_text) for row in batch])
+            resumes += len(batch)
+            last_id = batch[-1].resume_id
+            print(f"\rIndexed {resumes} resumes ({chunks} chunks)", end="", flush=True)
+    finally:
+        db.close()
+
+    print(f"\n✅ Done in {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible stand-in for the LLM and embeddings endpoints.
+
+Lets the API run (and be load tested) without the remote A4F endpoint:
+    synthetic  fabricate responses with configurable latency; JSON prompts get
+               JSON shaped after their "Response format" example or output schema
+    record     forward to the real endpoint and append every exchange to a cassette
+    replay     answer from the cassette (optionally falling back to synthetic)
+
+Responses are deterministic per request (and --seed), so runs are reproducible.
+
+Run this from the backend directory, then point the app at it:
+    python llm_standin.py --mode synthetic --latency-ms 800 --tokens-per-second 60
+    python llm_standin.py --mode record --cassette cassettes/llm.jsonl
+    python llm_standin.py --mode replay --cassette cassettes/llm.jsonl --fallback synthetic
+    LLM_STANDIN_URL=http://localhost:8100/v1 python run.py
+
+On a machine with no network, also set TIKTOKEN_CACHE_DIR to a pre-populated
+tiktoken cache: the OpenAI embeddings client tokenizes its input locally.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+import uvicorn
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+load_dotenv()
+
+SYNTHETIC_SKILLS = ["Python", "SQL", "Docker", "AWS", "React", "TypeScript", "Git", "REST APIs", "Kubernetes", "Communication"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible LLM stand-in with record/replay/synthetic modes.")
+    parser.add_argument("--mode", choices=["synthetic", "record", "replay"], default="synthetic")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--cassette", default="llm_cassette.jsonl", help="JSONL file of recorded exchanges")
+    parser.add_argument("--upstream", default=os.getenv("A4F_BASE_URL"), help="Real endpoint used in record mode")
+    parser.add_argument("--fallback", choices=["error", "synthetic"], default="error", help="Replay behaviour on a cassette miss")
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Synthetic time to first token")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Uniform +/- jitter on the time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Synthetic generation speed (0 = instant)")
+    parser.add_argument("--replay-latency-scale", type=float, default=1.0, help="Multiplier on recorded latencies (0 = instant)")
+    parser.add_argument("--response-words", type=int, default=80, help="Length of synthetic free-text answers")
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def request_key(kind: str, body: Dict[str, Any]) -> str:
+    """Cassette key: everything that influences the upstream answer, independent of streaming."""
+    relevant = {k: body.get(k) for k in ("model", "messages", "input", "temperature", "response_format", "tools", "tool_choice")}
+    payload = json.dumps({"kind": kind, **relevant}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def prompt_text(messages: List[Dict[str, Any]]) -> str:
+    parts = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        parts.append(content or "")
+    return "\n".join(parts)
+
+
+# --- Synthetic content -------------------------------------------------------
+
+class Synthesizer:
+    """Fabricates plausible answers, shaped after the JSON the prompt asks for."""
+
+    def __init__(self, response_words: int):
+        self.response_words = response_words
+
+    def chat(self, prompt: str, rng: random.Random) -> str:
+        schema = self._output_schema(prompt)
+        if schema is not None:
+            return json.dumps(self._from_schema(schema, schema.get("$defs", {}), "", rng))
+
+        example = self._response_example(prompt)
+        if example is not None:
+            job_ids = re.findall(r"^\s*### Job (\S+)", prompt, flags=re.MULTILINE)
+            return json.dumps(self._from_example(example, "", rng, job_ids))
+
+        words = ("This is a synthetic answer from the local LLM stand-in used for load testing. " * 20).split()
+        return " ".join(words[: self.response_words])
+
+    def _output_schema(self, prompt: str) -> Optional[Dict[str, Any]]:
+        # Pydantic/JSON output parsers embed the schema in a fenced block
+        for block in reversed(re.findall(r"```(?:json)?\s*(\{.*?\})\s*```", prompt, flags=re.DOTALL)):
+            try:
+                schema = json.loads(block)
+            except ValueError:
+                continue
+            if isinstance(schema, dict) and "properties" in schema:
+                return schema
+        return None
+
+    def _response_example(self, prompt: str) -> Optional[Any]:
+        match = re.search(r"Response format:\s*", prompt)
+        if not match:
+            return None
+        # Examples often elide items with a bare "...", which is not valid JSON
+        text = re.sub(r",\s*\.\.\.\s*(?=[\]}])", "", prompt[match.end():])
+        try:
+            example, _ = json.JSONDecoder().raw_decode(text)
+        except ValueError:
+            return None
+        return example
+
+    def _from_schema(self, schema: Dict[str, Any], defs: Dict[str, Any], name: str, rng: random.Random) -> Any:
+        if "$ref" in schema:
+            return self._from_schema(defs.get(schema["$ref"].split("/")[-1], {}), defs, name, rng)
+        for combinator in ("anyOf", "oneOf", "allOf"):
+            if combinator in schema:
+                options = [s for s in schema[combinator] if s.get("type") != "null"] or schema[combinator]
+                return self._from_schema(options[0], defs, name, rng)
+        if "enum" in schema:
+            return schema["enum"][0]
+
+        kind = schema.get("type", "object" if "properties" in schema else "string")
+        if kind == "object":
+            return {key: self._from_schema(sub, defs, key, rng) for key, sub in schema.get("properties", {}).items()}
+        if kind == "array":
+            return [self._from_schema(schema.get("items", {}), defs, name, rng) for _ in range(rng.randint(3, 5))]
+        if kind == "integer":
+            return rng.randint(int(schema.get("minimum", 1)), int(schema.get("maximum", 10)))
+        if kind == "number":
+            return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 1.0)), 2)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        return self._string(name, rng)
+
+    def _from_example(self, example: Any, name: str, rng: random.Random, job_ids: List[str]) -> Any:
+        if isinstance(example, dict):
+            return {key: self._from_example(value, key, rng, job_ids) for key, value in example.items()}
+        if isinstance(example, list):
+            if not example or example[-1] == "...":
+                example = [item for item in example if item != "..."]
+            template = example[0] if example else "..."
+            if isinstance(template, dict) and "job_id" in template and job_ids:
+                return [{**self._from_example(template, name, rng, []), "job_id": job_id} for job_id in job_ids]
+            return [self._from_example(template, name, rng, job_ids) for _ in range(rng.randint(3, 5))]
+        if isinstance(example, bool):
+            return rng.random() < 0.5
+        if isinstance(example, (int, float)):
+            return rng.randint(1, 10)
+        return self._string(name, rng)
+
+    def _string(self, name: str, rng: random.Random) -> str:
+        if "skill" in name.lower() or name == "":
+            return rng.choice(SYNTHETIC_SKILLS)
+        if "url" in name.lower():
+            return "https://example.com/resource"
+        return f"Synthetic {name.replace('_', ' ')} {rng.randint(1, 999)}"
+
+
+def synthetic_embedding(item: Any, dim: int, seed: int) -> List[float]:
+    digest = hashlib.sha256(f"{seed}:{json.dumps(item)}".encode("utf-8")).digest()
+    rng = random.Random(digest)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(dim)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+# --- OpenAI wire format ------------------------------------------------------
+
+def completion_body(model: str, content: str, prompt_tokens: int) -> Dict[str, Any]:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": estimate_tokens(content),
+            "total_tokens": prompt_tokens + estimate_tokens(content),
+        },
+    }
+
+
+def chunk_line(completion_id: str, model: str, delta: Dict[str, Any], finish_reason: Optional[str] = None, usage: Optional[Dict[str, Any]] = None) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    if usage:
+        chunk["usage"] = usage
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def create_app(args: argparse.Namespace) -> FastAPI:
+    app = FastAPI(title="LLM stand-in")
+    synthesizer = Synthesizer(args.response_words)
+    cassette: Dict[str, Dict[str, Any]] = {}
+    cassette_lock = asyncio.Lock()
+    stats = {"requests": 0, "replayed": 0, "recorded": 0, "synthetic": 0, "misses": 0}
+
+    if os.path.exists(args.cassette):
+        with open(args.cassette, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    cassette[entry["key"]] = entry
+        print(f"Loaded {len(cassette)} recorded exchanges from {args.cassette}")
+
+    upstream: Optional[httpx.AsyncClient] = None
+    if args.mode == "record":
+        if not args.upstream:
+            raise SystemExit("--upstream (or A4F_BASE_URL) is required in record mode")
+        upstream = httpx.AsyncClient(
+            base_url=args.upstream.rstrip("/") + "/",
+            headers={"Authorization": f"Bearer {os.getenv('A4F_API_KEY', '')}"},
+            timeout=httpx.Timeout(120.0),
+        )
+
+    def rng_for(key: str) -> random.Random:
+        return random.Random(f"{args.seed}:{key}")
+
+    def synthetic_latency(key: str, output_tokens: int) -> tuple:
+        rng = rng_for(key + ":latency")
+        first_token = max(0.0, args.latency_ms + rng.uniform(-args.jitter_ms, args.jitter_ms)) / 1000
+        per_token = 1 / args.tokens_per_second if args.tokens_per_second > 0 else 0.0
+        return first_token, per_token * output_tokens
+
+    async def record(kind: str, key: str, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        forwarded = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+        started = time.perf_counter()
+        response = await upstream.post(path, json=forwarded)
+        latency_ms = (time.perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            raise HTTPException(status_code=response.status_code, detail=response.text)
+        entry = {"key": key, "kind": kind, "latency_ms": latency_ms, "response": response.json()}
+        async with cassette_lock:
+            cassette[key] = entry
+            with open(args.cassette, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        stats["recorded"] += 1
+        return entry
+
+    async def resolve(kind: str, key: str, path: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Recorded entry for this request, or None when it should be synthesized."""
+        if args.mode == "synthetic":
+            return None
+        if args.mode == "record":
+            return await record(kind, key, path, body)
+        entry = cassette.get(key)
+        if entry is None:
+            stats["misses"] += 1
+            if args.fallback == "error":
+                raise HTTPException(status_code=404, detail=f"No recorded response for request {key[:12]}")
+            return None
+        stats["replayed"] += 1
+        return entry
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "standin", "object": "model", "owned_by": "local"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return {**stats, "mode": args.mode, "cassette_entries": len(cassette)}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        model = body.get("model", "standin")
+        key = request_key("chat", body)
+        prompt_tokens = estimate_tokens(prompt_text(body.get("messages", [])))
+
+        entry = await resolve("chat", key, "chat/completions", body)
+        if entry is None:
+            stats["synthetic"] += 1
+            content = synthesizer.chat(prompt_text(body.get("messages", [])), rng_for(key))
+            completion = completion_body(model, content, prompt_tokens)
+            first_token, generation = synthetic_latency(key, estimate_tokens(content))
+        else:
+            completion = entry["response"]
+            content = completion["choices"][0]["message"].get("content") or ""
+            # Recorded calls are not replayed slower in record mode: the real latency already happened
+            recorded = entry["latency_ms"] / 1000 * (args.replay_latency_scale if args.mode == "replay" else 0.0)
+            first_token, generation = recorded / 2, recorded / 2
+
+        if not body.get("stream"):
+            await asyncio.sleep(first_token + generation)
+            return JSONResponse(completion)
+
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        async def stream() -> AsyncIterator[str]:
+            completion_id = completion.get("id", f"chatcmpl-{uuid.uuid4().hex[:24]}")
+            await asyncio.sleep(first_token)
+            yield chunk_line(completion_id, model, {"role": "assistant", "content": ""})
+            pieces = re.findall(r"\S+\s*|\s+", content) or [""]
+            delay = generation / len(pieces)
+            for piece in pieces:
+                if delay:
+                    await asyncio.sleep(delay)
+                yield chunk_line(completion_id, model, {"content": piece})
+            yield chunk_line(completion_id, model, {}, finish_reason="stop")
+            if include_usage:
+                yield chunk_line(completion_id, model, {}, usage=completion.get("usage") or completion_body(model, content, prompt_tokens)["usage"])
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def create_embeddings(request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        key = request_key("embeddings", body)
+
+        entry = await resolve("embeddings", key, "embeddings", body)
+        if entry is not None:
+            return JSONResponse(entry["response"])
+
+        stats["synthetic"] += 1
+        inputs = body.get("input", [])
+        # A single string, a list of strings, or (tiktoken-chunked) lists of token ids
+        if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+            inputs = [inputs]
+        dim = int(body.get("dimensions") or args.embedding_dim)
+        return {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": i, "embedding": synthetic_embedding(item, dim, args.seed)}
+                for i, item in enumerate(inputs)
+            ],
+            "model": body.get("model", "standin"),
+            "usage": {"prompt_tokens": len(inputs), "total_tokens": len(inputs)},
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    cli_args = parse_args()
+    print(f"LLM stand-in ({cli_args.mode}) on http://{cli_args.host}:{cli_args.port}/v1")
+    uvicorn.run(create_app(cli_args), host=cli_args.host, port=cli_args.port, log_level="warning")
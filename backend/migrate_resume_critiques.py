@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Add the review cache columns to an existing resume_critiques table.
+
+create_tables.py only creates missing tables; it never alters existing ones, so
+deployments created before the review cache need these columns added. Every
+statement is idempotent, so the script can be re-run at any time.
+
+Run this from the backend directory:
+    python migrate_resume_critiques.py
+"""
+
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+STATEMENTS = (
+    "ALTER TABLE resume_critiques ADD COLUMN IF NOT EXISTS content_hash varchar(64)",
+    "ALTER TABLE resume_critiques ADD COLUMN IF NOT EXISTS prompt_version varchar",
+    "ALTER TABLE resume_critiques ADD COLUMN IF NOT EXISTS model_name varchar",
+    "CREATE INDEX IF NOT EXISTS ix_resume_critiques_content_hash ON resume_critiques (content_hash)",
+)
+
+
+def main() -> None:
+    start_time = time.time()
+    with engine.begin() as conn:
+        for statement in STATEMENTS:
+            print(statement)
+            conn.execute(text(statement))
+    print(f"\n✅ Done in {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
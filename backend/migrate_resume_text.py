@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Move resume_details.resume_text to compressed storage.
+
+Converts the resume_text column from text to bytea (plain UTF-8 at first, which
+CompressedText can still read), then recompresses every row with zstd and fills
+resume_preview. Rows already compressed are skipped, so the job can be stopped
+and re-run at any time.
+
+Run this from the backend directory:
+    python migrate_resume_text.py                  # convert, compress, report sizes
+    python migrate_resume_text.py --batch-size 100 # smaller transactions
+"""
+
+import argparse
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.db.models import RESUME_PREVIEW_LENGTH
+from app.db.types import ZSTD_MAGIC, compress_text, decompress_text
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compress resume_details.resume_text with zstd.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows compressed per transaction")
+    parser.add_argument("--vacuum", action="store_true", help="Run VACUUM FULL on resume_details afterwards to return the space")
+    return parser.parse_args()
+
+
+def table_size(conn) -> int:
+    return conn.execute(text("SELECT pg_total_relation_size('resume_details')")).scalar()
+
+
+def prepare_columns() -> None:
+    """Add the new columns and switch resume_text to bytea if that hasn't happened yet."""
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE resume_details ADD COLUMN IF NOT EXISTS resume_preview varchar({RESUME_PREVIEW_LENGTH})"))
+        conn.execute(text("ALTER TABLE resume_details ADD COLUMN IF NOT EXISTS content_hash varchar(64)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_resume_details_content_hash ON resume_details (content_hash)"))
+        data_type = conn.execute(text("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'resume_details' AND column_name = 'resume_text'
+              AND table_schema = current_schema()
+        """)).scalar()
+        if data_type == "text":
+            print("Converting resume_text to bytea...")
+            conn.execute(text(
+                "ALTER TABLE resume_details ALTER COLUMN resume_text TYPE bytea USING convert_to(resume_text, 'UTF8')"
+            ))
+
+
+def compress_rows(batch_size: int) -> int:
+    """Compress uncompressed rows in batches of primary keys; returns rows rewritten."""
+    done = 0
+    last_id = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text("""
+                    SELECT resume_id, resume_text FROM resume_details
+                    WHERE resume_id > :last_id AND resume_text IS NOT NULL
+                      AND (substring(resume_text from 1 for 4) <> :magic OR resume_preview IS NULL)
+                    ORDER BY resume_id
+                    LIMIT :limit
+                """),
+                {"last_id": last_id, "magic": ZSTD_MAGIC, "limit": batch_size},
+            ).all()
+            if not rows:
+                return done
+
+            updates = []
+            for resume_id, stored in rows:
+                resume_text = decompress_text(stored)
+                updates.append({
+                    "resume_id": resume_id,
+                    "resume_text": compress_text(resume_text),
+                    "resume_preview": resume_text[:RESUME_PREVIEW_LENGTH] or None,
+                })
+            conn.execute(
+                text("UPDATE resume_details SET resume_text = :resume_text, resume_preview = :resume_preview WHERE resume_id = :resume_id"),
+                updates,
+            )
+        done += len(rows)
+        last_id = rows[-1][0]
+        print(f"\rCompressed {done} resumes", end="", flush=True)
+
+
+def main() -> None:
+    args = parse_args()
+    start_time = time.time()
+
+    with engine.connect() as conn:
+        size_before = table_size(conn)
+
+    prepare_columns()
+    done = compress_rows(max(1, args.batch_size))
+    if done:
+        print()
+
+    if args.vacuum:
+        print("Vacuuming resume_details...")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM FULL ANALYZE resume_details"))
+
+    with engine.connect() as conn:
+        size_after = table_size(conn)
+
+    print(f"\nresume_details: {size_before / 1024:.1f} KB -> {size_after / 1024:.1f} KB"
+          f"{'' if args.vacuum else ' (run with --vacuum to reclaim freed space)'}")
+    print(f"✅ Done in {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
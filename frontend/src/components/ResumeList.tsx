@@ -9,7 +9,7 @@ interface Resume {
   user_id: number;
   file_name: string | null;
   file_path: string | null;
-  resume_text: string | null;
+  resume_preview: string | null;
   created_at: string;
   updated_at: string;
 }
@@ -121,9 +121,9 @@ const ResumeList: React.FC = () => {
                   <p className="text-xs text-gray-500 mt-1">
                     Uploaded {formatDate(resume.created_at)}
                   </p>
-                  {resume.resume_text && (
+                  {resume.resume_preview && (
                     <p className="text-xs text-gray-400 mt-2 line-clamp-2">
-                      {resume.resume_text.substring(0, 100)}...
+                      {resume.resume_preview.substring(0, 100)}...
                     </p>
                   )}
                 </div>
@@ -10,10 +10,17 @@ const ResumeUploader = () => {
   const [isDragOver, setIsDragOver] = useState(false);
   const [isUploading, setIsUploading] = useState(false);
   const [error, setError] = useState<string | null>(null);
-  const { setCurrentResumeId } = useResume();
+  const { currentResume, setCurrentResumeId } = useResume();
 
   const UPLOAD_ENDPOINT = "/upload/pdf";
 
+  // The upload response only carries a preview; the full text comes with the loaded resume
+  useEffect(() => {
+    if (currentResume) {
+      setResumeText(currentResume.content);
+    }
+  }, [currentResume]);
+
   const uploadFile = async (file: File) => {
     setIsUploading(true);
     setError(null);
@@ -28,12 +35,10 @@ const ResumeUploader = () => {
       const uploadResponse = await api.post(UPLOAD_ENDPOINT, formData);
       console.log("Upload successful:", uploadResponse.data);
 
-      // The upload endpoint now returns extracted text directly
       if (uploadResponse.data.success && uploadResponse.data.data) {
         const resumeData = uploadResponse.data.data;
-        setResumeText(resumeData.resume_text || "");
 
-        // Update current resume by ID only
+        // Loading the resume by ID also fetches its full text
         await setCurrentResumeId(resumeData.resume_id);
       }
     } catch (error: unknown) {
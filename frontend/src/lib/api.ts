@@ -239,12 +239,20 @@ export default api;
 export interface Message {
   role: "human" | "ai";
   content: string;
+  seq?: number;
 }
 
-export const getChatMessages = (resumeId: number): Promise<Message[]> => {
-    return api.get(`/chat/history/${resumeId}`)
+export interface ChatHistoryPage {
+  messages: Message[];
+  next_cursor: number | null;
+  has_more: boolean;
+}
+
+// Newest page first; pass the previous page's next_cursor as `before` to load older messages
+export const getChatMessages = (resumeId: number, before?: number, limit = 50): Promise<ChatHistoryPage> => {
+    return api.get(`/chat/history/${resumeId}`, { params: { before, limit } })
     .then((response) => {
-      return response.data as Message[];
+      return response.data as ChatHistoryPage;
     })
     .catch(error => {
       console.error("Error fetching chat messages:", error);
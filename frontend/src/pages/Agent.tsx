@@ -1,4 +1,4 @@
-import React, { useState, useRef, useEffect } from "react";
+import React, { useState, useRef, useEffect, useLayoutEffect } from "react";
 import { Send } from "lucide-react"; // Added Send icon
 import { useResume } from "../context/ResumeContext";
 import ResumeUploader from "../components/ResumeUploader";
@@ -6,6 +6,14 @@ import { getChatMessages, type Message } from "../lib/api";
 
 export function Agent() {
   const [messages, setMessages] = useState<Message[]>([]);
+  // `before` cursor for the next older page; null once the start of the thread is loaded
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
+  const [loadingEarlier, setLoadingEarlier] = useState(false);
+  const scrollRef = useRef<HTMLDivElement>(null);
+  // Scroll height before older messages were prepended, to keep the view in place
+  const prependedFrom = useRef<number | null>(null);
+  // Resume whose thread is on screen, so late pages for another resume are dropped
+  const activeResumeId = useRef<number | null>(null);
 
   const { currentResume } = useResume();
   const [input, setInput] = useState("");
@@ -57,35 +65,79 @@ export function Agent() {
 
 
   useEffect(() => {
+    setMessages([]);
+    setNextCursor(null);
+    activeResumeId.current = currentResume?.id ?? null;
     if(!currentResume) return;
-    getChatMessages(currentResume.id)
-    .then((msgs) => {
-      console.log(msgs);
-      
-      if(msgs) setMessages(msgs);
+    const resumeId = currentResume.id;
+    getChatMessages(resumeId)
+    .then((page) => {
+      if(page && activeResumeId.current === resumeId) {
+        setMessages(page.messages);
+        setNextCursor(page.next_cursor);
+      }
     }).catch((error) => {
       console.error("Error loading chat messages:", error);
     });
   }, [currentResume]);
 
+  const loadEarlier = () => {
+    if (!currentResume || nextCursor === null || loadingEarlier) return;
+    const resumeId = currentResume.id;
+    setLoadingEarlier(true);
+    getChatMessages(resumeId, nextCursor)
+    .then((page) => {
+      // Ignore a page that arrives after the user switched resumes
+      if (!page || activeResumeId.current !== resumeId) return;
+      prependedFrom.current = scrollRef.current?.scrollHeight ?? null;
+      setMessages((prev) => [...page.messages, ...prev]);
+      setNextCursor(page.next_cursor);
+    }).catch((error) => {
+      console.error("Error loading earlier chat messages:", error);
+    }).finally(() => {
+      setLoadingEarlier(false);
+    });
+  };
+
+  useLayoutEffect(() => {
+    const container = scrollRef.current;
+    if (container && prependedFrom.current !== null) {
+      container.scrollTop += container.scrollHeight - prependedFrom.current;
+      prependedFrom.current = null;
+    }
+  }, [messages]);
+
   return (
     <div className="h-full w-full bg-slate-50 flex flex-col relative">
       {currentResume?.id ? (
         <>
           {/* 1. SCROLLABLE MESSAGE AREA */}
           {/* flex-1 makes this take up all remaining space above the input */}
-          <div className="flex-1 overflow-y-auto p-4 pb-32 scroll-smooth">
+          <div ref={scrollRef} className="flex-1 overflow-y-auto p-4 pb-32 scroll-smooth">
             <div className="max-w-3xl mx-auto space-y-6">
-              
+
+              {nextCursor !== null && (
+                <div className="flex justify-center">
+                  <button
+                    type="button"
+                    onClick={loadEarlier}
+                    disabled={loadingEarlier}
+                    className="text-sm text-blue-600 hover:text-blue-800 disabled:text-gray-400"
+                  >
+                    {loadingEarlier ? "Loading..." : "Load earlier messages"}
+                  </button>
+                </div>
+              )}
+
               {messages.map((msg, index) =>{
                 return msg.role === "ai"? 
-                <div className="flex items-start" key={index}>
+                <div className="flex items-start" key={msg.seq ?? index}>
                   <div className="bg-blue-100 text-blue-900 rounded-2xl rounded-tl-none px-5 py-3 max-w-md shadow-sm">
                     {msg.content}
                   </div>
                 </div>
                 :(
-              <div className="flex items-end justify-end" key={index}>
+              <div className="flex items-end justify-end" key={msg.seq ?? index}>
                 <div className="bg-white border border-gray-200 text-gray-900 rounded-2xl rounded-tr-none px-5 py-3 max-w-md shadow-sm">
                   {msg.content}
                 </div>
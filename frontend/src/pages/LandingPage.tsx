@@ -15,6 +15,13 @@ export function LandingPage() {
 
   const UPLOAD_ENDPOINT = "/upload/pdf";
 
+  // The upload response only carries a preview; the full text comes with the loaded resume
+  useEffect(() => {
+    if (currentResume) {
+      setResumeText(currentResume.content);
+    }
+  }, [currentResume]);
+
   // Load existing resumes when page loads
   // useEffect(() => {
   //   const loadCurrentResume = async () => {
@@ -59,12 +66,10 @@ export function LandingPage() {
       const uploadResponse = await api.post(UPLOAD_ENDPOINT, formData);
       console.log("Upload successful:", uploadResponse.data);
 
-      // The upload endpoint now returns extracted text directly
       if (uploadResponse.data.success && uploadResponse.data.data) {
         const resumeData = uploadResponse.data.data;
-        setResumeText(resumeData.resume_text || '');
 
-        // Update current resume by ID only
+        // Loading the resume by ID also fills the text area with its full text
         await setCurrentResumeId(resumeData.resume_id);
       }
 